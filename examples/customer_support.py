@@ -162,9 +162,10 @@ def main() -> None:
             "send_email": 10,
         },
     )
+    level1_js = level1_sandbox.with_language("javascript")
 
     # Simulate ticket handling
-    result = level1_sandbox.run(
+    result = level1_js(
         """
         // Ticket: Customer C001 reports damaged item, wants refund
 
@@ -196,8 +197,7 @@ def main() -> None:
             subject: "Your refund request",
             body: "We're processing your refund request..."
         });
-    """,
-        language="javascript",
+    """
     )
     print(result)
 
@@ -230,33 +230,37 @@ def main() -> None:
             "apply_discount": 5,
         },
     )
+    level2_js = level2_sandbox.with_language("javascript")
 
-    result = level2_sandbox.run(
+    result = level2_js(
         """
         // Ticket: Customer C001 unhappy with service, high-value order issue
 
-        const customer = await get_customer({customer_id: "C001"});
-        const orders = await get_orders({customer_id: "C001"});
+        const [customer, orders] = await Promise.all([
+            get_customer({customer_id: "C001"}),
+            get_orders({customer_id: "C001"}),
+        ]);
 
         console.log("Handling escalated ticket for:", customer.name);
 
-        // Process refund for damaged order
-        const refund = await issue_refund({
-            order_id: orders[0].id,
-            amount: 149.99,
-            reason: "customer_satisfaction"
-        });
+        // Refund the damaged order and apply a courtesy discount together;
+        // neither depends on the other
+        const [refund, discount] = await Promise.all([
+            issue_refund({
+                order_id: orders[0].id,
+                amount: 149.99,
+                reason: "customer_satisfaction"
+            }),
+            apply_discount({
+                customer_id: customer.id,
+                discount_percent: 15,
+                reason: "service_recovery"
+            }),
+        ]);
         console.log("Refund processed:", refund.amount);
-
-        // Apply courtesy discount for inconvenience
-        const discount = await apply_discount({
-            customer_id: customer.id,
-            discount_percent: 15,
-            reason: "service_recovery"
-        });
         console.log("Discount applied:", discount.code);
 
-        // Send resolution email
+        // Only send the resolution email once both have gone through
         await send_email({
             to: customer.email,
             subject: "Issue resolved - with a thank you",
@@ -264,15 +268,14 @@ def main() -> None:
         });
 
         console.log("\\nTicket resolved with refund + discount");
-    """,
-        language="javascript",
+    """
     )
     print(result)
 
     # --- Constraint Violation Example ---
     print("\n=== Constraint Enforcement Example ===")
 
-    result = level1_sandbox.run(
+    result = level1_js(
         """
         // L1 agent tries to issue a large refund
 
@@ -297,16 +300,18 @@ def main() -> None:
         } catch (e) {
             console.log("Refund blocked: reason not in allowed list");
         }
-    """,
-        language="javascript",
+    """
     )
     print(result)
 
     # --- Multi-Step Resolution Flow ---
     print("\n=== Multi-Step Resolution Flow ===")
 
-    result = level2_sandbox.run(
-        """
+    # With the tool stubs prepended this script is larger than the command
+    # size limit, so it is piped via stdin instead.
+    result = level2_js(
+        "",
+        stdin="""
         // Complex ticket: Multiple issues to resolve
 
         const customerId = "C001";
@@ -341,7 +346,7 @@ def main() -> None:
             actions: ["partial_refund", "loyalty_discount"],
             resolution: "Customer satisfied with partial refund and future discount"
         };
-        await fs.writeFile('/state/ticket_resolution.json', JSON.stringify(notes, null, 2));
+        await fs.writeFile('/workspace/ticket_resolution.json', JSON.stringify(notes));
         console.log("3. Resolution notes saved");
 
         // 4. Send final email
@@ -354,7 +359,6 @@ def main() -> None:
 
         console.log("\\n=== Ticket Closed ===");
     """,
-        language="javascript",
     )
     print(result)
 
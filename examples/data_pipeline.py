@@ -6,36 +6,63 @@ Shows extract-transform-load (ETL) patterns using sandbox tools.
 Run: python data_pipeline.py
 """
 
+import functools
 from typing import Any
 
 from amla_sandbox import create_sandbox_tool
 
+# Preformatted ID columns, so building a batch doesn't format strings per row
+_SALES_IDS = tuple(f"S{i}" for i in range(50))
+_PRODUCT_IDS = tuple(f"P{i}" for i in range(5))
+_CUSTOMER_IDS = tuple(f"C{i}" for i in range(30))
+_CUSTOMER_NAMES = tuple(f"Customer {i}" for i in range(30))
+_TIERS = ("gold", "silver", "bronze")
+
 
 def fetch_source_data(source: str, batch_size: int = 100) -> dict[str, Any]:
     """Fetch data from a source system."""
+    records, total_available = _fetch_cached(source, batch_size)
+    return {
+        "source": source,
+        "records": records,
+        "total_available": total_available,
+    }
+
+
+@functools.lru_cache(maxsize=16)
+def _fetch_cached(
+    source: str, batch_size: int
+) -> tuple[tuple[dict[str, Any], ...], int]:
+    """Build the records for a source once per (source, batch_size).
+
+    The records are shared between calls, so they're returned as a tuple
+    (serialized as a JSON array) and must not be mutated.
+    """
     if source == "sales":
-        return {
-            "source": source,
-            "records": [
-                {"id": f"S{i}", "product": f"P{i % 5}", "amount": 100 + i * 10}
-                for i in range(min(batch_size, 50))
-            ],
-            "total_available": 1000,
-        }
+        return (
+            tuple(
+                {
+                    "id": _SALES_IDS[i],
+                    "product": _PRODUCT_IDS[i % 5],
+                    "amount": 100 + i * 10,
+                }
+                for i in range(min(batch_size, len(_SALES_IDS)))
+            ),
+            1000,
+        )
     elif source == "customers":
-        return {
-            "source": source,
-            "records": [
+        return (
+            tuple(
                 {
-                    "id": f"C{i}",
-                    "name": f"Customer {i}",
-                    "tier": ["gold", "silver", "bronze"][i % 3],
+                    "id": _CUSTOMER_IDS[i],
+                    "name": _CUSTOMER_NAMES[i],
+                    "tier": _TIERS[i % 3],
                 }
-                for i in range(min(batch_size, 30))
-            ],
-            "total_available": 500,
-        }
-    return {"source": source, "records": [], "total_available": 0}
+                for i in range(min(batch_size, len(_CUSTOMER_IDS)))
+            ),
+            500,
+        )
+    return (), 0
 
 
 def validate_record(record: dict[str, Any], schema: str) -> dict[str, Any]:
@@ -59,10 +86,11 @@ def main() -> None:
         tools=[fetch_source_data, validate_record, load_to_warehouse],
         max_calls=200,
     )
+    js = sandbox.with_language("javascript")
 
     # Example 1: Simple ETL Pipeline
     print("--- Simple ETL Pipeline ---")
-    result = sandbox.run(
+    result = js(
         """
         console.log("ETL Pipeline\\n");
         const data = await fetch_source_data({source: "sales", batch_size: 5});
@@ -77,14 +105,13 @@ def main() -> None:
 
         const load = await load_to_warehouse({table: "fact_sales", records: valid});
         console.log("Loaded:", load.records_loaded, "to", load.table);
-    """,
-        language="javascript",
+    """
     )
     print(result)
 
     # Example 2: Multi-Source Pipeline
     print("\n--- Multi-Source Pipeline ---")
-    result = sandbox.run(
+    result = js(
         """
         console.log("Multi-source ETL\\n");
         const results = {};
@@ -95,14 +122,13 @@ def main() -> None:
             console.log(src + ":", load.records_loaded, "loaded");
         }
         console.log("\\nTotal sources:", Object.keys(results).length);
-    """,
-        language="javascript",
+    """
     )
     print(result)
 
     # Example 3: Batched Processing with VFS Checkpoint
     print("\n--- Batched Processing ---")
-    result = sandbox.run(
+    result = js(
         """
         const data = await fetch_source_data({source: "sales", batch_size: 12});
         let processed = 0;
@@ -116,14 +142,13 @@ def main() -> None:
             console.log("Batch", Math.floor(i/batchSize)+1, "- total:", processed);
         }
         console.log("\\nFinal checkpoint:", await fs.readFile("/workspace/checkpoint.json"));
-    """,
-        language="javascript",
+    """
     )
     print(result)
 
     # Example 4: Data Quality Check
     print("\n--- Data Quality Check ---")
-    result = sandbox.run(
+    result = js(
         """
         const data = await fetch_source_data({source: "sales", batch_size: 10});
         let valid = 0, total = 0, sum = 0;
@@ -137,8 +162,7 @@ def main() -> None:
         console.log("  Records:", total);
         console.log("  Valid:", valid, "(" + Math.round(valid/total*100) + "%)");
         console.log("  Total Amount: $" + sum);
-    """,
-        language="javascript",
+    """
     )
     print(result)
 
@@ -18,6 +18,10 @@ Run:
 Time: ~15 minutes
 """
 
+import functools
+import json
+import sys
+from collections.abc import Callable
 from typing import Any
 
 from amla_sandbox import (
@@ -30,6 +34,24 @@ from amla_sandbox import (
     create_sandbox_tool,
 )
 
+
+@functools.lru_cache(maxsize=1)
+def _js_runner() -> Callable[..., str]:
+    """Tool-less JavaScript runner shared by the parts that need no tools.
+
+    Each run starts a fresh JS context, so reusing the sandbox is safe;
+    sandboxes with tools or call budgets are built per part because their
+    budgets are consumed as the demos run.
+    """
+    return create_sandbox_tool().with_language("javascript")
+
+
+def _show(result: str) -> None:
+    """Write a sandbox result indented under its heading in one write."""
+    lines = result.strip().splitlines() or [""]
+    sys.stdout.write("".join(f"   {line}\n" for line in lines))
+
+
 # =============================================================================
 # Part 1: Types of Errors
 # =============================================================================
@@ -90,12 +112,14 @@ def part2_capability_violations() -> None:
     def handler(_method: str, params: dict[str, Any]) -> dict[str, Any]:
         return {"transferred": params["amount"], "to": params["to"]}
 
-    # Sandbox with limited capabilities
+    # Sandbox with limited capabilities. JS tool calls arrive under their
+    # "mcp:" name, so that is what the capability has to match.
+    method = "mcp:transfer"
     sandbox = Sandbox(
         tools=tools,
         capabilities=[
             MethodCapability(
-                method_pattern="transfer",
+                method_pattern=method,
                 constraints=ConstraintSet(
                     [
                         Param("amount") <= 1000,
@@ -111,20 +135,10 @@ def part2_capability_violations() -> None:
     # Demo 1: Constraint violation
     print("\n1. Constraint Violation (amount > 1000):")
     try:
-        # Using can_call first is the recommended pattern
-        if not sandbox.can_call("transfer", {"amount": 5000, "to": "alice"}):
-            print("   Pre-check: Call would be denied")
-
-        # If you try anyway, you get an error in JS
-        result = sandbox.execute("""
-            try {
-                const r = await transfer({amount: 5000, to: "alice"});
-                console.log("Unexpected success:", r);
-            } catch (e) {
-                console.log("Caught in JS:", e.message);
-            }
-        """)
-        print(f"   {result.strip()}")
+        # try_call checks capabilities and calls the tool in a single pass,
+        # straight from Python with no JavaScript involved
+        result = sandbox.try_call(method, {"amount": 5000, "to": "alice"})
+        print(f"   Unexpected success: {result}")
     except CapabilityError as e:
         print(f"   Caught in Python: {e}")
 
@@ -138,29 +152,24 @@ def part2_capability_violations() -> None:
             console.log("Caught in JS:", e.message);
         }
     """)
-    print(f"   {result.strip()}")
+    _show(result)
 
     # Demo 3: Budget exhaustion
     print("\n3. Call Budget Exhaustion:")
-    # Make 3 valid calls to exhaust budget
-    for i in range(3):
-        sandbox.execute(f"""
-            await transfer({{amount: 100, to: "user{i}"}});
-        """)
-        print(
-            f"   Call {i + 1}: Success (remaining: {sandbox.get_remaining_calls('cap:method:transfer')})"
-        )
-
-    # Fourth call should fail
+    # Make 3 valid calls to exhaust the budget, then a fourth that fails.
+    # All four go through one JS run instead of one execute() per call.
     result = sandbox.execute("""
-        try {
-            const r = await transfer({amount: 100, to: "user4"});
-            console.log("Unexpected success");
-        } catch (e) {
-            console.log("Caught in JS:", e.message);
+        for (let i = 1; i <= 4; i++) {
+            try {
+                await transfer({amount: 100, to: `user${i}`});
+                console.log(`Call ${i}: Success`);
+            } catch (e) {
+                console.log(`Call ${i}: Caught in JS:`, e.message);
+            }
         }
     """)
-    print(f"   Call 4: {result.strip()}")
+    _show(result)
+    print(f"   Remaining: {sandbox.get_remaining_calls(f'cap:method:{method}')}")
 
 
 # =============================================================================
@@ -174,18 +183,18 @@ def part3_js_errors() -> None:
     print("Part 3: JavaScript Error Handling")
     print("=" * 60)
 
-    sandbox = create_sandbox_tool()
+    js = _js_runner()
 
     # Syntax errors
     print("\n1. Syntax Errors:")
     try:
-        sandbox.run("const x = {", language="javascript")  # Invalid syntax
+        js("const x = {")  # Invalid syntax
     except Exception as e:
         print(f"   Caught: {type(e).__name__}")
 
     # Runtime errors
     print("\n2. Runtime Errors:")
-    result = sandbox.run(
+    result = js(
         """
         try {
             const obj = null;
@@ -193,28 +202,26 @@ def part3_js_errors() -> None:
         } catch (e) {
             console.log("Caught:", e.name, "-", e.message);
         }
-    """,
-        language="javascript",
+    """
     )
-    print(f"   {result.strip()}")
+    _show(result)
 
     # Reference errors
     print("\n3. Reference Errors:")
-    result = sandbox.run(
+    result = js(
         """
         try {
             undefinedVariable;  // ReferenceError
         } catch (e) {
             console.log("Caught:", e.name, "-", e.message);
         }
-    """,
-        language="javascript",
+    """
     )
-    print(f"   {result.strip()}")
+    _show(result)
 
     # Custom thrown errors
     print("\n4. Custom Thrown Errors:")
-    result = sandbox.run(
+    result = js(
         """
         function validateAge(age) {
             if (age < 0) throw new Error("Age cannot be negative");
@@ -227,10 +234,9 @@ def part3_js_errors() -> None:
         } catch (e) {
             console.log("Validation failed:", e.message);
         }
-    """,
-        language="javascript",
+    """
     )
-    print(f"   {result.strip()}")
+    _show(result)
 
 
 # =============================================================================
@@ -290,7 +296,7 @@ def part4_tool_handler_errors() -> None:
             console.log("Error:", e.message);
         }
     """)
-    print(f"   {result.strip()}")
+    _show(result)
 
     # Timeout error
     print("\n2. Timeout Error:")
@@ -302,7 +308,7 @@ def part4_tool_handler_errors() -> None:
             console.log("Error:", e.message);
         }
     """)
-    print(f"   {result.strip()}")
+    _show(result)
 
     # Validation error
     print("\n3. Validation Error:")
@@ -314,7 +320,7 @@ def part4_tool_handler_errors() -> None:
             console.log("Error:", e.message);
         }
     """)
-    print(f"   {result.strip()}")
+    _show(result)
 
     # Division by zero
     print("\n4. Division by Zero:")
@@ -326,7 +332,7 @@ def part4_tool_handler_errors() -> None:
             console.log("Error:", e.message);
         }
     """)
-    print(f"   {result.strip()}")
+    _show(result)
 
 
 # =============================================================================
@@ -334,18 +340,25 @@ def part4_tool_handler_errors() -> None:
 # =============================================================================
 
 
-def part5_graceful_degradation() -> None:
-    """Patterns for graceful error handling."""
-    print("\n" + "=" * 60)
-    print("Part 5: Graceful Degradation Patterns")
-    print("=" * 60)
+# Marker printed between patterns so one run can be split per pattern
+_PATTERN_SEPARATOR = "<<end-of-pattern>>"
 
+_DEGRADATION_PATTERNS: tuple[tuple[str, str], ...] = (
     # Pattern 1: Retry with exponential backoff
-    print("\n1. Retry Pattern:")
-    sandbox = create_sandbox_tool()
-    result = sandbox.run(
+    (
+        "Retry Pattern",
         """
-        async function fetchWithRetry(fn, maxRetries = 3) {
+        // Retrying can't fix a denied capability (failed constraint or
+        // exhausted budget) or a bug in the calling code
+        function isUnrecoverable(e) {
+            return e instanceof ReferenceError
+                || e instanceof TypeError
+                || String(e?.message ?? e).includes("permission_denied");
+        }
+
+        async function fetchWithRetry(
+            fn, maxRetries = 3, baseDelay = 1000, maxDelay = 30000, jitter = 0.5
+        ) {
             let lastError;
             for (let attempt = 1; attempt <= maxRetries; attempt++) {
                 try {
@@ -353,7 +366,17 @@ def part5_graceful_degradation() -> None:
                 } catch (e) {
                     lastError = e;
                     console.log(`Attempt ${attempt} failed: ${e.message}`);
-                    // In real code, you'd add delay here
+                    if (isUnrecoverable(e) || attempt === maxRetries) break;
+                    // Most faults are one-off, so retry once right away and
+                    // only start backing off if that fails too. Jitter keeps
+                    // clients that failed together from retrying in lockstep.
+                    const backoff = baseDelay * 2 ** (attempt - 2);
+                    const delay = attempt === 1
+                        ? 0
+                        : Math.round(
+                            Math.min(maxDelay, backoff * (1 + Math.random() * jitter))
+                        );
+                    await new Promise(resolve => setTimeout(resolve, delay));
                 }
             }
             throw lastError;
@@ -374,14 +397,20 @@ def part5_graceful_degradation() -> None:
         } catch (e) {
             console.log("All retries failed:", e.message);
         }
-    """,
-        language="javascript",
-    )
-    print(f"   {result}")
 
+        // A denied call fails once instead of burning every attempt
+        try {
+            await fetchWithRetry(async () => {
+                throw new Error("tool call 'mcp:transfer' failed: permission_denied");
+            });
+        } catch (e) {
+            console.log("Gave up without retrying");
+        }
+    """,
+    ),
     # Pattern 2: Fallback values
-    print("\n2. Fallback Pattern:")
-    result = sandbox.run(
+    (
+        "Fallback Pattern",
         """
         async function getDataWithFallback(primary, fallback) {
             try {
@@ -398,35 +427,61 @@ def part5_graceful_degradation() -> None:
         );
         console.log("Got data:", JSON.stringify(data));
     """,
-        language="javascript",
-    )
-    print(f"   {result}")
-
+    ),
     # Pattern 3: Circuit breaker
-    print("\n3. Circuit Breaker Pattern:")
-    result = sandbox.run(
+    (
+        "Circuit Breaker Pattern",
         """
         class CircuitBreaker {
-            constructor(threshold = 3, resetTimeout = 5000) {
-                this.failures = 0;
-                this.threshold = threshold;
+            // Trips when more than errorThreshold of the last windowSize calls
+            // failed, so intermittent failures count, not just unbroken runs.
+            // `now` is injectable so the cool-down can be driven by a clock
+            // other than wall time.
+            constructor(
+                windowSize = 4, errorThreshold = 0.5, resetTimeout = 5000, now = Date.now
+            ) {
+                this.outcomes = new Array(windowSize).fill(null);  // 1 = failed
+                this.next = 0;
+                this.errorThreshold = errorThreshold;
                 this.state = 'CLOSED';
                 this.resetTimeout = resetTimeout;
+                this.now = now;
+                this.openedAt = 0;
+            }
+
+            record(failed) {
+                this.outcomes[this.next] = failed ? 1 : 0;
+                this.next = (this.next + 1) % this.outcomes.length;
+            }
+
+            failureRate() {
+                // Don't judge until the window has filled up
+                if (this.outcomes.includes(null)) return 0;
+                return this.outcomes.reduce((a, b) => a + b, 0) / this.outcomes.length;
             }
 
             async call(fn) {
                 if (this.state === 'OPEN') {
-                    throw new Error('Circuit breaker is OPEN');
+                    // No timer: the cool-down is checked when a call arrives
+                    if (this.now() - this.openedAt < this.resetTimeout) {
+                        throw new Error('Circuit breaker is OPEN');
+                    }
+                    this.state = 'HALF_OPEN';  // Let a trial call through
                 }
 
                 try {
                     const result = await fn();
-                    this.failures = 0;
+                    if (this.state === 'HALF_OPEN') {
+                        this.outcomes.fill(null);  // Start over once recovered
+                        this.state = 'CLOSED';
+                    }
+                    this.record(false);
                     return result;
                 } catch (e) {
-                    this.failures++;
-                    if (this.failures >= this.threshold) {
+                    this.record(true);
+                    if (this.state === 'HALF_OPEN' || this.failureRate() > this.errorThreshold) {
                         this.state = 'OPEN';
+                        this.openedAt = this.now();
                         console.log('Circuit breaker tripped!');
                     }
                     throw e;
@@ -434,24 +489,27 @@ def part5_graceful_degradation() -> None:
             }
         }
 
-        const breaker = new CircuitBreaker(2);
+        let clock = 0;
+        const breaker = new CircuitBreaker(2, 0.5, 5000, () => clock);
         const failingFn = async () => { throw new Error("Service error"); };
 
-        for (let i = 1; i <= 4; i++) {
+        for (let i = 1; i <= 3; i++) {
             try {
                 await breaker.call(failingFn);
             } catch (e) {
                 console.log(`Call ${i}: ${e.message} (state: ${breaker.state})`);
             }
         }
-    """,
-        language="javascript",
-    )
-    print(f"   {result}")
 
+        // Once the cool-down has passed, a successful trial call closes it
+        clock += 5000;
+        const recovered = await breaker.call(async () => "Service recovered");
+        console.log(`Call 4: ${recovered} (state: ${breaker.state})`);
+    """,
+    ),
     # Pattern 4: Result type pattern
-    print("\n4. Result Type Pattern:")
-    result = sandbox.run(
+    (
+        "Result Type Pattern",
         """
         // Return {ok, value/error} instead of throwing
         async function safeOperation(fn) {
@@ -476,9 +534,28 @@ def part5_graceful_degradation() -> None:
             console.log("Handling error:", result2.error);
         }
     """,
-        language="javascript",
+    ),
+)
+
+
+def part5_graceful_degradation() -> None:
+    """Patterns for graceful error handling."""
+    print("\n" + "=" * 60)
+    print("Part 5: Graceful Degradation Patterns")
+    print("=" * 60)
+
+    # Run every pattern in one sandbox call; each gets its own async scope
+    # so their declarations don't collide. The combined script is piped
+    # via stdin since it exceeds the command size limit.
+    script = "".join(
+        f"await (async () => {{{code}}})();\nconsole.log({_PATTERN_SEPARATOR!r});\n"
+        for _, code in _DEGRADATION_PATTERNS
     )
-    print(f"   {result}")
+    outputs = _js_runner()("", stdin=script).split(_PATTERN_SEPARATOR)
+
+    for i, ((title, _), output) in enumerate(zip(_DEGRADATION_PATTERNS, outputs), 1):
+        print(f"\n{i}. {title}:")
+        _show(output)
 
 
 # =============================================================================
@@ -509,25 +586,49 @@ Best practice: Use can_call() BEFORE attempting operations.
 This avoids wasting compute and provides better error messages.
     """)
 
-    # Demonstrate pre-flight checking
+    # Demonstrate pre-flight checking. Tools are registered under their
+    # "mcp:" name, which is what JS calls arrive as.
+    method = "mcp:payment_send"
     test_amounts = [500, 1000, 1500, 100, 200, 300, 400]
 
+    # Filter out constraint violations up front in Python, then send every
+    # payment that passed in one JS run instead of one execute() per amount.
+    # The JS reports whether each payment went through.
+    allowed = sandbox.can_call_batch(method, [{"amount": a} for a in test_amounts])
+    approved = [a for a, can in zip(test_amounts, allowed) if can]
+
+    output = sandbox.execute(
+        "const results = [];\n"
+        f"for (const amount of {json.dumps(approved)}) {{\n"
+        "    try {\n"
+        "        await payment_send({amount});\n"
+        "        results.push({amount, ok: true});\n"
+        "    } catch (e) {\n"
+        "        results.push({amount, ok: false, error: String(e?.message ?? e)});\n"
+        "    }\n"
+        "}\n"
+        "console.log(JSON.stringify(results));"
+    )
+    outcomes = iter(json.loads(output.strip().splitlines()[-1]))
+
+    # The runtime's own counter. Every payment here passed its constraints,
+    # so once the budget is spent, that is why the rest were refused.
+    remaining = sandbox.get_remaining_calls(f"cap:method:{method}")
+
     print("Pre-flight checks:")
-    for amount in test_amounts:
-        params = {"amount": amount}
-        can = sandbox.can_call("payment_send", params)
-
-        if can:
-            # Actually make the call
-            remaining = sandbox.get_remaining_calls("cap:method:payment_send")
-            if remaining is not None and remaining > 0:
-                sandbox.execute(f"await payment_send({{amount: {amount}}});")
-                new_remaining = sandbox.get_remaining_calls("cap:method:payment_send")
-                print(f"  ${amount}: ✓ Sent (remaining: {new_remaining})")
-            else:
-                print(f"  ${amount}: ✗ Budget exhausted")
+    for amount, can in zip(test_amounts, allowed):
+        if not can:
+            status = "✗ Constraint violated (amount > 1000)"
         else:
-            print(f"  ${amount}: ✗ Constraint violated (amount > 1000)")
+            outcome = next(outcomes)
+            if outcome["ok"]:
+                status = "✓ Sent"
+            elif remaining == 0:
+                status = "✗ Budget exhausted"
+            else:
+                status = f"✗ Failed: {outcome['error']}"
+        print(f"  ${amount}: {status}")
+    print(f"Calls remaining: {'unlimited' if remaining is None else remaining}")
 
 
 # =============================================================================
@@ -596,10 +697,12 @@ DEBUGGING TIPS:
 
     # Test specific calls
     print("\n  Authorization tests:")
+    # can_call() depends on the remaining budget, so it is checked live
+    # rather than cached. Tools are registered under their "mcp:" name.
     tests: list[tuple[str, dict[str, str]]] = [
-        ("process", {"data": "hello"}),
-        ("process", {}),  # Missing required field
-        ("other_method", {}),  # No capability
+        ("mcp:process", {"data": "hello"}),
+        ("mcp:process", {}),  # Missing optional field
+        ("mcp:other_method", {}),  # No capability
     ]
     for method, params in tests:
         can = sandbox.can_call(method, params)
@@ -20,11 +20,7 @@ Usage:
 from typing import Any
 
 from amla_sandbox import create_sandbox_tool
-from amla_sandbox.tools import (
-    from_anthropic_tools,
-    from_langchain,
-    from_openai_tools,
-)
+from amla_sandbox.tools import from_anthropic_tools, from_openai_tools
 
 
 # =============================================================================
@@ -203,6 +199,8 @@ def langchain_example() -> None:
         print("Install with: pip install langchain-core")
         return
 
+    from amla_sandbox.tools import from_langchain
+
     # LangChain @tool decorated functions
     @tool
     def translate(text: str, to_language: str = "Spanish") -> str:
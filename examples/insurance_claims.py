@@ -18,6 +18,7 @@ The Workflow:
     - Gateway: "Verified and paid"
 """
 
+import functools
 from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
@@ -31,12 +32,18 @@ from amla_sandbox import (
 )
 
 
+@functools.lru_cache(maxsize=256)
+def _cents(amount: int) -> str:
+    """Format an amount in cents as dollars, e.g. 330000 -> "$3300.00"."""
+    return f"${amount / 100:.2f}"
+
+
 # =============================================================================
 # Domain Types
 # =============================================================================
 
 
-@dataclass
+@dataclass(slots=True)
 class Claim:
     """An insurance claim."""
 
@@ -46,7 +53,7 @@ class Claim:
     description: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Assessment:
     """Damage assessment result."""
 
@@ -64,15 +71,38 @@ class Assessment:
 class MockInsuranceBackend:
     """Simulates the insurance company's backend systems."""
 
+    __slots__ = (
+        "_next_claim_number",
+        "_policies",
+        "assessments",
+        "call_log",
+        "claims",
+        "latest_assessment_id",
+        "payouts",
+    )
+
     def __init__(self) -> None:
         self.claims: dict[str, Claim] = {}
         self.assessments: dict[str, Assessment] = {}
         self.payouts: dict[str, int] = {}
-        self.call_log: list[str] = []
+        self.latest_assessment_id: str | None = None
+        # Not derived from len(self.claims), so IDs stay unique if claims
+        # are ever removed
+        self._next_claim_number = 1
+        # Policies fetched on behalf of claims, keyed by customer_id
+        self._policies: dict[str, dict[str, Any]] = {}
+        # (method, args) per call; formatted only when someone reads the log
+        self.call_log: list[tuple[str, tuple[Any, ...]]] = []
+
+    def formatted_log(self) -> list[str]:
+        """Render the call log as ``method(arg, ...)`` strings."""
+        return [
+            f"{method}({', '.join(map(str, args))})" for method, args in self.call_log
+        ]
 
     def policy_lookup(self, customer_id: str) -> dict[str, Any]:
         """Look up customer's policy."""
-        self.call_log.append(f"policy.lookup({customer_id})")
+        self.call_log.append(("policy.lookup", (customer_id,)))
         return {
             "customer_id": customer_id,
             "policy_type": "auto",
@@ -80,13 +110,20 @@ class MockInsuranceBackend:
             "deductible": 50000,  # $500 deductible
         }
 
+    def _policy(self, customer_id: str) -> dict[str, Any]:
+        """Get a customer's policy, fetching it at most once per backend."""
+        policy = self._policies.get(customer_id)
+        if policy is None:
+            policy = self._policies[customer_id] = self.policy_lookup(customer_id)
+        return policy
+
     def claims_create(
         self, customer_id: str, description: str, amount: int
     ) -> dict[str, Any]:
         """Create a new claim."""
-        self.call_log.append(f"claims.create({customer_id}, amount={amount})")
-        claim_id = f"CLM-{len(self.claims) + 1:06d}"
-        policy = self.policy_lookup(customer_id)
+        self.call_log.append(("claims.create", (customer_id, amount)))
+        claim_id = f"CLM-{self._next_claim_number:06d}"
+        policy = self._policy(customer_id)
 
         # Enforce policy max
         if amount > policy["max_claim"]:
@@ -101,6 +138,7 @@ class MockInsuranceBackend:
             description=description,
         )
         self.claims[claim_id] = claim
+        self._next_claim_number += 1
         return {
             "claim_id": claim_id,
             "status": "created",
@@ -109,12 +147,12 @@ class MockInsuranceBackend:
 
     def claims_assess(self, claim_id: str, assessed_amount: int) -> dict[str, Any]:
         """Record damage assessment."""
-        self.call_log.append(f"claims.assess({claim_id}, amount={assessed_amount})")
+        self.call_log.append(("claims.assess", (claim_id, assessed_amount)))
         claim = self.claims.get(claim_id)
         if not claim:
             raise ValueError(f"Claim {claim_id} not found")
 
-        policy = self.policy_lookup(claim.customer_id)
+        policy = self._policy(claim.customer_id)
         deductible = policy["deductible"]
         payout = max(0, assessed_amount - deductible)
 
@@ -125,6 +163,7 @@ class MockInsuranceBackend:
             payout_amount=payout,
         )
         self.assessments[claim_id] = assessment
+        self.latest_assessment_id = claim_id
         return {
             "claim_id": claim_id,
             "assessed": assessed_amount,
@@ -134,7 +173,7 @@ class MockInsuranceBackend:
 
     def payout_execute(self, claim_id: str, amount: int) -> dict[str, Any]:
         """Execute the payout."""
-        self.call_log.append(f"payout.execute({claim_id}, amount={amount})")
+        self.call_log.append(("payout.execute", (claim_id, amount)))
         assessment = self.assessments.get(claim_id)
         if not assessment:
             raise ValueError(f"No assessment for claim {claim_id}")
@@ -157,22 +196,24 @@ ToolHandler = Callable[[str, dict[str, Any]], dict[str, Any]]
 def create_tool_handler(backend: MockInsuranceBackend) -> ToolHandler:
     """Create tool handler that routes to backend."""
 
+    # Dispatch table built once per backend, not re-walked on every call
+    routes: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
+        "policy.lookup": lambda p: backend.policy_lookup(p["customer_id"]),
+        "claims.create": lambda p: backend.claims_create(
+            p["customer_id"], p["description"], p["amount"]
+        ),
+        "claims.assess": lambda p: backend.claims_assess(
+            p["claim_id"], p["assessed_amount"]
+        ),
+        "payout.execute": lambda p: backend.payout_execute(p["claim_id"], p["amount"]),
+    }
+
     def handler(method: str, params: dict[str, Any]) -> dict[str, Any]:
         # Route based on method name (mcp:toolname format)
-        tool_name = method.replace("mcp:", "")
-
-        if tool_name == "policy.lookup":
-            return backend.policy_lookup(params["customer_id"])
-        elif tool_name == "claims.create":
-            return backend.claims_create(
-                params["customer_id"], params["description"], params["amount"]
-            )
-        elif tool_name == "claims.assess":
-            return backend.claims_assess(params["claim_id"], params["assessed_amount"])
-        elif tool_name == "payout.execute":
-            return backend.payout_execute(params["claim_id"], params["amount"])
-        else:
+        route = routes.get(method.removeprefix("mcp:"))
+        if route is None:
             raise ValueError(f"Unknown tool: {method}")
+        return route(params)
 
     return handler
 
@@ -327,19 +368,25 @@ def run_happy_path(backend: MockInsuranceBackend) -> None:
     print("Customer files a claim -> Claims Agent processes -> Payout executes")
     print()
 
+    # Both agents talk to the same backend, so they share one handler
+    tool_handler = create_tool_handler(backend)
+
     # Step 1: Claims Agent processes the claim
     print("--- Claims Agent ---")
     claims_agent = Sandbox(
         tools=TOOLS,
         capabilities=make_claims_agent_caps(),
-        tool_handler=create_tool_handler(backend),
+        tool_handler=tool_handler,
     )
 
-    print("  Capabilities:")
+    # Build the listing from one budget snapshot and write it in one go
+    lines = ["  Capabilities:"]
+    budgets = claims_agent.get_call_counts()
     for cap in claims_agent.get_capabilities():
-        remaining = claims_agent.get_remaining_calls(cap.key())
+        remaining = budgets.get(cap.key())
         budget = f"budget: {remaining}" if remaining else "unlimited"
-        print(f"    - {cap.method_pattern} ({budget})")
+        lines.append(f"    - {cap.method_pattern} ({budget})")
+    print("\n".join(lines))
 
     # Agent creates and assesses the claim
     result = claims_agent.execute("""
@@ -363,7 +410,9 @@ def run_happy_path(backend: MockInsuranceBackend) -> None:
 
     # Get assessment from the backend directly (in production, would be passed via PCA chain)
 
-    claim_id = list(backend.assessments.keys())[0]
+    claim_id = backend.latest_assessment_id
+    if claim_id is None:
+        raise RuntimeError("Claims agent did not record an assessment")
     assessment = {
         "claim_id": claim_id,
         "payout_approved": backend.assessments[claim_id].payout_amount,
@@ -372,20 +421,22 @@ def run_happy_path(backend: MockInsuranceBackend) -> None:
 
     # Step 2: Payout Agent (with attenuated capability)
     print("--- Payout Agent ---")
-    print(f"  Delegated with max payout: ${payout_amount / 100:.2f}")
+    print(f"  Delegated with max payout: {_cents(payout_amount)}")
 
     payout_agent = Sandbox(
         tools=TOOLS,
         capabilities=make_payout_agent_caps(payout_amount),  # Attenuated!
-        tool_handler=create_tool_handler(backend),
+        tool_handler=tool_handler,
     )
 
-    print("  Capabilities:")
+    lines = ["  Capabilities:"]
+    budgets = payout_agent.get_call_counts()
     for cap in payout_agent.get_capabilities():
-        remaining = payout_agent.get_remaining_calls(cap.key())
-        print(f"    - {cap.method_pattern} (budget: {remaining})")
+        remaining = budgets.get(cap.key())
+        lines.append(f"    - {cap.method_pattern} (budget: {remaining})")
         if cap.constraints:
-            print(f"      constraints: amount <= ${payout_amount / 100:.2f}")
+            lines.append(f"      constraints: amount <= {_cents(payout_amount)}")
+    print("\n".join(lines))
 
     result = payout_agent.execute(f"""
         const result = await payout_execute({{
@@ -400,7 +451,7 @@ def run_happy_path(backend: MockInsuranceBackend) -> None:
     print("--- Result ---")
     print("  Claim processed successfully!")
     claim_id = str(assessment["claim_id"])
-    print(f"  Payout: ${backend.payouts[claim_id] / 100:.2f}")
+    print(f"  Payout: {_cents(backend.payouts[claim_id])}")
     print()
 
 
@@ -416,6 +467,8 @@ def run_attack_scenarios(backend: MockInsuranceBackend) -> None:
     print("=" * 70)
     print()
 
+    tool_handler = create_tool_handler(backend)
+
     # Attack 1: Claims Agent tries to execute payout directly
     print("--- Attack 1: Claims Agent Tries Direct Payout ---")
     print("  Claims Agent says: 'I'll just pay myself directly!'")
@@ -424,7 +477,7 @@ def run_attack_scenarios(backend: MockInsuranceBackend) -> None:
     claims_agent = Sandbox(
         tools=TOOLS,
         capabilities=make_claims_agent_caps(),  # No payout capability!
-        tool_handler=create_tool_handler(backend),
+        tool_handler=tool_handler,
     )
 
     # Check if agent can even call payout
@@ -443,7 +496,7 @@ def run_attack_scenarios(backend: MockInsuranceBackend) -> None:
     payout_agent = Sandbox(
         tools=TOOLS,
         capabilities=make_payout_agent_caps(330000),  # Max $3,300
-        tool_handler=create_tool_handler(backend),
+        tool_handler=tool_handler,
     )
 
     can_high_payout = payout_agent.can_call("mcp:payout.execute", {"amount": 5000000})
@@ -458,15 +511,13 @@ def run_attack_scenarios(backend: MockInsuranceBackend) -> None:
     print("  Payout Agent says: 'Let me process another payout!'")
     print()
 
-    payout_agent = Sandbox(
-        tools=TOOLS,
-        capabilities=make_payout_agent_caps(330000),  # max_calls=1
-        tool_handler=create_tool_handler(backend),
-    )
+    # Reuse the Attack 2 sandbox with a fresh grant instead of paying for
+    # another runtime; replace_capabilities() restores the budget
+    payout_caps = make_payout_agent_caps(330000)  # max_calls=1
+    payout_key = payout_caps[0].key()
+    payout_agent.replace_capabilities(payout_caps)
 
-    print(
-        f"  Initial budget: {payout_agent.get_remaining_calls('cap:method:mcp:payout.execute')}"
-    )
+    print(f"  Initial budget: {payout_agent.get_remaining_calls(payout_key)}")
 
     # First payout succeeds
     try:
@@ -478,9 +529,7 @@ def run_attack_scenarios(backend: MockInsuranceBackend) -> None:
     except Exception as e:
         print(f"  First payout error: {e}")
 
-    print(
-        f"  Budget after first: {payout_agent.get_remaining_calls('cap:method:mcp:payout.execute')}"
-    )
+    print(f"  Budget after first: {payout_agent.get_remaining_calls(payout_key)}")
 
     # Second payout fails
     can_second = payout_agent.can_call("mcp:payout.execute", {"amount": 100000})
@@ -499,7 +548,7 @@ def run_attack_scenarios(backend: MockInsuranceBackend) -> None:
     _eve_sandbox = Sandbox(
         tools=TOOLS,
         capabilities=make_attacker_caps(),  # Eve's fake caps
-        tool_handler=create_tool_handler(backend),
+        tool_handler=tool_handler,
     )
 
     # Even if Eve has matching patterns, the backend will reject
@@ -532,6 +581,7 @@ def run_dx_demo() -> None:
     print()
 
     backend = MockInsuranceBackend()
+    tool_handler = create_tool_handler(backend)
 
     sandbox = Sandbox(
         tools=TOOLS,
@@ -544,24 +594,28 @@ def run_dx_demo() -> None:
             ),
             MethodCapability(method_pattern="mcp:claims.assess", max_calls=50),
         ],
-        tool_handler=create_tool_handler(backend),
+        tool_handler=tool_handler,
     )
 
     # 1. Introspect capabilities
-    print("--- 1. List All Capabilities ---")
+    lines = ["--- 1. List All Capabilities ---"]
     for cap in sandbox.get_capabilities():
-        print(f"  {cap.key()}")
+        lines.append(f"  {cap.key()}")
         if cap.max_calls:
-            print(f"    max_calls: {cap.max_calls}")
+            lines.append(f"    max_calls: {cap.max_calls}")
         if cap.constraints:
-            print(f"    constraints: {len(cap.constraints)} rules")
+            lines.append(f"    constraints: {len(cap.constraints)} rules")
+    print("\n".join(lines))
     print()
 
     # 2. Check budgets
     print("--- 2. Check Budgets ---")
     budgets = sandbox.get_call_counts()
-    for key, remaining in budgets.items():
-        print(f"  {key}: {remaining} remaining")
+    print(
+        "\n".join(
+            f"  {key}: {remaining} remaining" for key, remaining in budgets.items()
+        )
+    )
     print()
 
     # 3. Pre-flight authorization check
@@ -588,17 +642,25 @@ def run_dx_demo() -> None:
 
     # 4. Budget consumption tracking
     print("--- 4. Budget Tracking After Operations ---")
-    print(
-        f"  Before: policy.lookup budget = {sandbox.get_remaining_calls('cap:method:mcp:policy.lookup')}"
+    lookup_key = next(
+        cap.key()
+        for cap in sandbox.get_capabilities()
+        if cap.method_pattern == "mcp:policy.lookup"
     )
-
-    sandbox.execute('await policy_lookup({customer_id: "CUST-001"});')
-    sandbox.execute('await policy_lookup({customer_id: "CUST-002"});')
-    sandbox.execute('await policy_lookup({customer_id: "CUST-003"});')
-
-    print(
-        f"  After 3 lookups: budget = {sandbox.get_remaining_calls('cap:method:mcp:policy.lookup')}"
+    print(f"  Before: policy.lookup budget = {sandbox.get_remaining_calls(lookup_key)}")
+
+    # One execute() for all three lookups: each call still draws on the budget.
+    # Only the side effect matters here, so no output is captured.
+    sandbox.execute(
+        """
+        await policy_lookup({customer_id: "CUST-001"});
+        await policy_lookup({customer_id: "CUST-002"});
+        await policy_lookup({customer_id: "CUST-003"});
+    """,
+        capture_stdout=False,
     )
+
+    print(f"  After 3 lookups: budget = {sandbox.get_remaining_calls(lookup_key)}")
     print()
 
 
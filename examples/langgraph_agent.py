@@ -19,7 +19,9 @@ Run:
 Time: ~25 minutes
 """
 
+import itertools
 import os
+from types import MappingProxyType
 from typing import Any
 
 from amla_sandbox import (
@@ -31,6 +33,47 @@ from amla_sandbox import (
     ToolDefinition,
 )
 
+# =============================================================================
+# Demo data (read-only, built once at import instead of on every tool call).
+# The entries are frozen too: mappings are proxies and lists are tuples.
+# =============================================================================
+
+_WEATHER = MappingProxyType(
+    {
+        "San Francisco": MappingProxyType({"temp": 18, "condition": "foggy"}),
+        "Tokyo": MappingProxyType({"temp": 25, "condition": "sunny"}),
+        "London": MappingProxyType({"temp": 12, "condition": "rainy"}),
+        "New York": MappingProxyType({"temp": 22, "condition": "cloudy"}),
+    }
+)
+_DEFAULT_WEATHER = MappingProxyType({"temp": 20, "condition": "unknown"})
+
+_ORDERS = MappingProxyType(
+    {
+        "ORD-12345": MappingProxyType(
+            {
+                "status": "shipped",
+                "items": ("Widget x2",),
+                "tracking": "1Z999AA10123456784",
+            }
+        ),
+        "ORD-67890": MappingProxyType(
+            {
+                "status": "processing",
+                "items": ("Gadget x1", "Cable x3"),
+                "tracking": None,
+            }
+        ),
+    }
+)
+
+_INVENTORY = MappingProxyType(
+    {
+        "WIDGET-001": MappingProxyType({"in_stock": 150, "reorder_point": 50}),
+        "GADGET-002": MappingProxyType({"in_stock": 3, "reorder_point": 20}),
+    }
+)
+
 # =============================================================================
 # Part 1: Introduction to LangGraph + amla-sandbox
 # =============================================================================
@@ -87,14 +130,7 @@ def part2_simple_integration() -> None:
         Args:
             city: The city name (e.g., "San Francisco", "Tokyo")
         """
-        weather_data = {
-            "San Francisco": {"temp": 18, "condition": "foggy"},
-            "Tokyo": {"temp": 25, "condition": "sunny"},
-            "London": {"temp": 12, "condition": "rainy"},
-            "New York": {"temp": 22, "condition": "cloudy"},
-        }
-        data = weather_data.get(city, {"temp": 20, "condition": "unknown"})
-        return {"city": city, **data}
+        return {"city": city, **_WEATHER.get(city, _DEFAULT_WEATHER)}
 
     def search_products(query: str, max_results: int = 5) -> dict[str, Any]:
         """Search for products in the catalog.
@@ -176,21 +212,9 @@ def part3_react_agent() -> None:
         Args:
             order_id: The order identifier (e.g., "ORD-12345")
         """
-        orders = {
-            "ORD-12345": {
-                "status": "shipped",
-                "items": ["Widget x2"],
-                "tracking": "1Z999AA10123456784",
-            },
-            "ORD-67890": {
-                "status": "processing",
-                "items": ["Gadget x1", "Cable x3"],
-                "tracking": None,
-            },
-        }
-        order = orders.get(order_id)
+        order = _ORDERS.get(order_id)
         if order:
-            return {"order_id": order_id, **order}
+            return {"order_id": order_id, **order, "items": list(order["items"])}
         return {"error": f"Order {order_id} not found"}
 
     def check_inventory(product_id: str) -> dict[str, Any]:
@@ -199,11 +223,13 @@ def part3_react_agent() -> None:
         Args:
             product_id: The product identifier
         """
-        inventory = {
-            "WIDGET-001": {"in_stock": 150, "reorder_point": 50},
-            "GADGET-002": {"in_stock": 3, "reorder_point": 20},
-        }
-        return inventory.get(product_id, {"error": f"Product {product_id} not found"})
+        stock = _INVENTORY.get(product_id)
+        if stock is None:
+            return {"error": f"Product {product_id} not found"}
+        return dict(stock)
+
+    # Sequential ticket numbers: unique within the session, unlike a hash
+    ticket_numbers = itertools.count(1)
 
     def create_support_ticket(
         customer_id: str, issue: str, priority: str = "normal"
@@ -216,7 +242,7 @@ def part3_react_agent() -> None:
             priority: Priority level (low, normal, high, urgent)
         """
         return {
-            "ticket_id": f"TKT-{hash(issue) % 10000:04d}",
+            "ticket_id": f"TKT-{next(ticket_numbers):04d}",
             "customer_id": customer_id,
             "issue": issue,
             "priority": priority,
@@ -379,10 +405,10 @@ def part4_advanced_config() -> None:
         tools=tools,
         capabilities=[
             # Read-only balance check - unlimited
-            MethodCapability(method_pattern="banking.balance"),
+            MethodCapability(method_pattern="mcp:banking.balance"),
             # Transfers - constrained
             MethodCapability(
-                method_pattern="banking.transfer",
+                method_pattern="mcp:banking.transfer",
                 constraints=ConstraintSet(
                     [
                         Param("amount") > 0,
@@ -396,7 +422,7 @@ def part4_advanced_config() -> None:
             ),
             # Statements - limited time range
             MethodCapability(
-                method_pattern="banking.statement",
+                method_pattern="mcp:banking.statement",
                 constraints=ConstraintSet(
                     [
                         Param("days") <= 30,  # Max 30 days of history
@@ -418,38 +444,33 @@ def part4_advanced_config() -> None:
             print("    has_constraints: yes")
     print()
 
-    # Test authorization
+    # Test authorization: one can_call_batch() over parallel columns
     print("Authorization tests:")
-    tests = [
-        ("banking.balance", {"account_id": "ACC-123"}, True),
-        (
-            "banking.transfer",
-            {"from_account": "A", "to_account": "B", "amount": 500, "currency": "USD"},
-            True,
-        ),
-        (
-            "banking.transfer",
-            {"from_account": "A", "to_account": "B", "amount": 5000, "currency": "USD"},
-            False,
-        ),  # Too much
-        (
-            "banking.transfer",
-            {"from_account": "A", "to_account": "B", "amount": 500, "currency": "BTC"},
-            False,
-        ),  # Wrong currency
-        ("banking.statement", {"account_id": "ACC-123", "days": 30}, True),
-        (
-            "banking.statement",
-            {"account_id": "ACC-123", "days": 90},
-            False,
-        ),  # Too many days
+    transfer = {"from_account": "A", "to_account": "B"}
+    methods = [
+        "mcp:banking.balance",
+        "mcp:banking.transfer",
+        "mcp:banking.transfer",
+        "mcp:banking.transfer",
+        "mcp:banking.statement",
+        "mcp:banking.statement",
+    ]
+    params = [
+        {"account_id": "ACC-123"},
+        {**transfer, "amount": 500, "currency": "USD"},
+        {**transfer, "amount": 5000, "currency": "USD"},  # Too much
+        {**transfer, "amount": 500, "currency": "BTC"},  # Wrong currency
+        {"account_id": "ACC-123", "days": 30},
+        {"account_id": "ACC-123", "days": 90},  # Too many days
     ]
+    expected = [True, True, False, False, True, False]
 
-    for method, params, expected in tests:
-        can = sandbox.can_call(method, params)
-        status = "PASS" if can == expected else "FAIL"
+    for method, can, want in zip(
+        methods, sandbox.can_call_batch(methods, params), expected
+    ):
+        status = "PASS" if can == want else "FAIL"
         result = "allowed" if can else "denied"
-        print(f"  [{status}] {method}: {result}")
+        print(f"  [{status}] {method.removeprefix('mcp:')}: {result}")
 
     # Execute with constraints
     print("\nExecuting authorized operations:")
@@ -22,6 +22,8 @@ Run:
 """
 
 import argparse
+import functools
+import itertools
 import os
 import sys
 from datetime import datetime
@@ -29,7 +31,10 @@ from typing import Any
 
 from dotenv import load_dotenv
 
-load_dotenv()
+# Only walk up for a .env file if the environment doesn't already provide
+# everything these examples read.
+if not all(name in os.environ for name in ("OPENAI_API_KEY", "OPENAI_MODEL")):
+    load_dotenv(override=False)
 
 
 # =============================================================================
@@ -37,85 +42,151 @@ load_dotenv()
 # =============================================================================
 
 
+_STOCKS: dict[str, dict[str, Any]] = {
+    "AAPL": {"price": 178.50, "change": 2.30, "volume": 45_000_000},
+    "GOOGL": {"price": 141.25, "change": -0.75, "volume": 22_000_000},
+    "MSFT": {"price": 378.90, "change": 4.20, "volume": 18_000_000},
+    "NVDA": {"price": 721.33, "change": 15.40, "volume": 35_000_000},
+    "AMZN": {"price": 178.25, "change": -1.20, "volume": 28_000_000},
+    "META": {"price": 505.75, "change": 8.90, "volume": 15_000_000},
+    "TSLA": {"price": 248.50, "change": -5.30, "volume": 95_000_000},
+}
+
+
 def get_stock_price(symbol: str) -> dict[str, Any]:
     """Get current stock price and daily change.
 
     Args:
         symbol: Stock ticker symbol (e.g., "AAPL", "GOOGL", "MSFT", "NVDA")
     """
-    stocks = {
-        "AAPL": {"price": 178.50, "change": 2.30, "volume": 45_000_000},
-        "GOOGL": {"price": 141.25, "change": -0.75, "volume": 22_000_000},
-        "MSFT": {"price": 378.90, "change": 4.20, "volume": 18_000_000},
-        "NVDA": {"price": 721.33, "change": 15.40, "volume": 35_000_000},
-        "AMZN": {"price": 178.25, "change": -1.20, "volume": 28_000_000},
-        "META": {"price": 505.75, "change": 8.90, "volume": 15_000_000},
-        "TSLA": {"price": 248.50, "change": -5.30, "volume": 95_000_000},
-    }
     symbol = symbol.upper()
-    if symbol in stocks:
+    stock = _STOCKS.get(symbol)
+    if stock is not None:
         return {
             "symbol": symbol,
-            **stocks[symbol],
+            **stock,
             "timestamp": datetime.now().isoformat(),
         }
     return {"symbol": symbol, "error": "Symbol not found"}
 
 
+_COMPANIES: dict[str, dict[str, Any]] = {
+    "AAPL": {"name": "Apple Inc.", "sector": "Technology", "employees": 164000},
+    "GOOGL": {"name": "Alphabet Inc.", "sector": "Technology", "employees": 182000},
+    "MSFT": {
+        "name": "Microsoft Corp.",
+        "sector": "Technology",
+        "employees": 221000,
+    },
+    "NVDA": {"name": "NVIDIA Corp.", "sector": "Technology", "employees": 29600},
+    "AMZN": {
+        "name": "Amazon.com Inc.",
+        "sector": "Consumer Cyclical",
+        "employees": 1540000,
+    },
+    "META": {
+        "name": "Meta Platforms Inc.",
+        "sector": "Technology",
+        "employees": 67317,
+    },
+    "TSLA": {"name": "Tesla Inc.", "sector": "Automotive", "employees": 140000},
+}
+
+
 def get_company_info(symbol: str) -> dict[str, Any]:
     """Get company information and sector.
 
     Args:
         symbol: Stock ticker symbol
     """
-    companies = {
-        "AAPL": {"name": "Apple Inc.", "sector": "Technology", "employees": 164000},
-        "GOOGL": {"name": "Alphabet Inc.", "sector": "Technology", "employees": 182000},
-        "MSFT": {
-            "name": "Microsoft Corp.",
-            "sector": "Technology",
-            "employees": 221000,
-        },
-        "NVDA": {"name": "NVIDIA Corp.", "sector": "Technology", "employees": 29600},
-        "AMZN": {
-            "name": "Amazon.com Inc.",
-            "sector": "Consumer Cyclical",
-            "employees": 1540000,
-        },
-        "META": {
-            "name": "Meta Platforms Inc.",
-            "sector": "Technology",
-            "employees": 67317,
-        },
-        "TSLA": {"name": "Tesla Inc.", "sector": "Automotive", "employees": 140000},
-    }
     symbol = symbol.upper()
-    if symbol in companies:
-        return {"symbol": symbol, **companies[symbol]}
+    company = _COMPANIES.get(symbol)
+    if company is not None:
+        return {"symbol": symbol, **company}
     return {"symbol": symbol, "error": "Company not found"}
 
 
+_RATINGS: dict[str, dict[str, Any]] = {
+    "AAPL": {"rating": "Buy", "target": 200.00, "analysts": 45},
+    "GOOGL": {"rating": "Strong Buy", "target": 165.00, "analysts": 52},
+    "MSFT": {"rating": "Strong Buy", "target": 420.00, "analysts": 48},
+    "NVDA": {"rating": "Strong Buy", "target": 850.00, "analysts": 55},
+    "AMZN": {"rating": "Buy", "target": 210.00, "analysts": 50},
+    "META": {"rating": "Buy", "target": 550.00, "analysts": 42},
+    "TSLA": {"rating": "Hold", "target": 265.00, "analysts": 38},
+}
+
+
 def get_analyst_rating(symbol: str) -> dict[str, Any]:
     """Get analyst consensus rating and price target.
 
     Args:
         symbol: Stock ticker symbol
     """
-    ratings = {
-        "AAPL": {"rating": "Buy", "target": 200.00, "analysts": 45},
-        "GOOGL": {"rating": "Strong Buy", "target": 165.00, "analysts": 52},
-        "MSFT": {"rating": "Strong Buy", "target": 420.00, "analysts": 48},
-        "NVDA": {"rating": "Strong Buy", "target": 850.00, "analysts": 55},
-        "AMZN": {"rating": "Buy", "target": 210.00, "analysts": 50},
-        "META": {"rating": "Buy", "target": 550.00, "analysts": 42},
-        "TSLA": {"rating": "Hold", "target": 265.00, "analysts": 38},
-    }
     symbol = symbol.upper()
-    if symbol in ratings:
-        return {"symbol": symbol, **ratings[symbol]}
+    rating = _RATINGS.get(symbol)
+    if rating is not None:
+        return {"symbol": symbol, **rating}
     return {"symbol": symbol, "error": "No rating available"}
 
 
+_NEWS: list[dict[str, Any]] = [
+    {
+        "title": "NVIDIA Announces New AI Chip",
+        "source": "Reuters",
+        "sentiment": "positive",
+        "ticker": "NVDA",
+    },
+    {
+        "title": "Apple Vision Pro Sales Exceed Expectations",
+        "source": "Bloomberg",
+        "sentiment": "positive",
+        "ticker": "AAPL",
+    },
+    {
+        "title": "Microsoft Azure Revenue Grows 29%",
+        "source": "CNBC",
+        "sentiment": "positive",
+        "ticker": "MSFT",
+    },
+    {
+        "title": "Tesla Recalls 2M Vehicles",
+        "source": "WSJ",
+        "sentiment": "negative",
+        "ticker": "TSLA",
+    },
+    {
+        "title": "Meta's AI Assistant Reaches 100M Users",
+        "source": "TechCrunch",
+        "sentiment": "positive",
+        "ticker": "META",
+    },
+    {
+        "title": "Amazon Expands Same-Day Delivery",
+        "source": "Reuters",
+        "sentiment": "positive",
+        "ticker": "AMZN",
+    },
+    {
+        "title": "Google Antitrust Trial Begins",
+        "source": "NYT",
+        "sentiment": "negative",
+        "ticker": "GOOGL",
+    },
+    {
+        "title": "Tech Sector Outlook Remains Strong",
+        "source": "Barrons",
+        "sentiment": "positive",
+        "ticker": None,
+    },
+]
+
+# Lowercased title/ticker per article, so searches don't re-lower them per call
+_NEWS_SEARCH_TEXT = [
+    (n, n["title"].lower(), (n["ticker"] or "").lower()) for n in _NEWS
+]
+
+
 def search_news(query: str, limit: int = 5) -> list[dict[str, Any]]:
     """Search financial news articles.
 
@@ -123,64 +194,16 @@ def search_news(query: str, limit: int = 5) -> list[dict[str, Any]]:
         query: Search query (company name, ticker, or topic)
         limit: Maximum articles to return
     """
-    all_news = [
-        {
-            "title": "NVIDIA Announces New AI Chip",
-            "source": "Reuters",
-            "sentiment": "positive",
-            "ticker": "NVDA",
-        },
-        {
-            "title": "Apple Vision Pro Sales Exceed Expectations",
-            "source": "Bloomberg",
-            "sentiment": "positive",
-            "ticker": "AAPL",
-        },
-        {
-            "title": "Microsoft Azure Revenue Grows 29%",
-            "source": "CNBC",
-            "sentiment": "positive",
-            "ticker": "MSFT",
-        },
-        {
-            "title": "Tesla Recalls 2M Vehicles",
-            "source": "WSJ",
-            "sentiment": "negative",
-            "ticker": "TSLA",
-        },
-        {
-            "title": "Meta's AI Assistant Reaches 100M Users",
-            "source": "TechCrunch",
-            "sentiment": "positive",
-            "ticker": "META",
-        },
-        {
-            "title": "Amazon Expands Same-Day Delivery",
-            "source": "Reuters",
-            "sentiment": "positive",
-            "ticker": "AMZN",
-        },
-        {
-            "title": "Google Antitrust Trial Begins",
-            "source": "NYT",
-            "sentiment": "negative",
-            "ticker": "GOOGL",
-        },
-        {
-            "title": "Tech Sector Outlook Remains Strong",
-            "source": "Barrons",
-            "sentiment": "positive",
-            "ticker": None,
-        },
-    ]
     query_lower = query.lower()
     matches = [
         n
-        for n in all_news
-        if query_lower in str(n["title"]).lower()
-        or (n["ticker"] is not None and query_lower in str(n["ticker"]).lower())
+        for n, title, ticker in _NEWS_SEARCH_TEXT
+        if query_lower in title or query_lower in ticker
     ]
-    return matches[:limit] if matches else all_news[:limit]
+    return matches[:limit] if matches else _NEWS[:limit]
+
+
+_order_numbers = itertools.count(1)
 
 
 def execute_trade(symbol: str, action: str, quantity: int) -> dict[str, Any]:
@@ -194,17 +217,18 @@ def execute_trade(symbol: str, action: str, quantity: int) -> dict[str, Any]:
     if action.lower() not in ("buy", "sell"):
         return {"error": "Action must be 'buy' or 'sell'"}
 
-    price_data = get_stock_price(symbol)
-    if "error" in price_data:
-        return price_data
+    symbol = symbol.upper()
+    stock = _STOCKS.get(symbol)
+    if stock is None:
+        return {"symbol": symbol, "error": "Symbol not found"}
 
-    total = price_data["price"] * quantity
+    total = stock["price"] * quantity
     return {
-        "order_id": f"ORD-{abs(hash(symbol + action)) % 100000:05d}",
-        "symbol": symbol.upper(),
+        "order_id": f"ORD-{next(_order_numbers):05d}",
+        "symbol": symbol,
         "action": action.lower(),
         "quantity": quantity,
-        "price": price_data["price"],
+        "price": stock["price"],
         "total": round(total, 2),
         "status": "executed",
         "timestamp": datetime.now().isoformat(),
@@ -237,14 +261,15 @@ def calculate_metrics(prices: list[float]) -> dict[str, float | str]:
     mean = sum(prices) / n
     variance = sum((p - mean) ** 2 for p in prices) / n
     std_dev = variance**0.5
+    low, high = min(prices), max(prices)
 
     return {
         "count": n,
         "mean": round(mean, 2),
-        "min": round(min(prices), 2),
-        "max": round(max(prices), 2),
+        "min": round(low, 2),
+        "max": round(high, 2),
         "std_dev": round(std_dev, 2),
-        "range": round(max(prices) - min(prices), 2),
+        "range": round(high - low, 2),
     }
 
 
@@ -253,9 +278,48 @@ def calculate_metrics(prices: list[float]) -> dict[str, float | str]:
 # =============================================================================
 
 
+def _print_trace(
+    messages: list[Any], *, max_code: int, show_language: bool = False
+) -> None:
+    """Print the sandbox code the agent generated and its replies."""
+    from langchain_core.messages import AIMessage
+
+    for msg in messages:
+        if not isinstance(msg, AIMessage):
+            continue
+        for tc in msg.tool_calls:
+            if tc.get("name") == "sandbox":
+                args = tc.get("args", {})
+                code = args.get("code", "")
+                if show_language:
+                    lang = args.get("language", "javascript")
+                    print(f"\n[Generated {lang.upper()}]:")
+                else:
+                    print("\n[Generated Code]:")
+                print(code[:max_code] + "..." if len(code) > max_code else code)
+        if msg.content:
+            print(f"\nAssistant: {msg.content}")
+
+
+@functools.lru_cache(maxsize=1)
+def _model_name() -> str:
+    """Resolve OPENAI_MODEL once (after .env has been loaded)."""
+    return os.environ.get("OPENAI_MODEL", "gpt-5")
+
+
+@functools.lru_cache(maxsize=1)
+def _get_model() -> Any:
+    """Create the chat model once, so every example reuses its HTTP client."""
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model=_model_name(),
+        temperature=0,
+    )
+
+
 def example_1_portfolio_analysis() -> None:
     """Example 1: Multi-step portfolio analysis with code generation."""
-    from langchain_openai import ChatOpenAI
     from langgraph.prebuilt import create_react_agent
     from amla_sandbox import create_sandbox_tool
 
@@ -275,10 +339,7 @@ This example shows the LLM writing JavaScript to:
         max_calls=50,
     )
 
-    model = ChatOpenAI(
-        model=os.environ.get("OPENAI_MODEL", "gpt-5"),
-        temperature=0,
-    )
+    model = _get_model()
 
     # Use code generation approach
     agent: Any = create_react_agent(
@@ -306,15 +367,7 @@ This example shows the LLM writing JavaScript to:
     )
 
     # Show the code that was generated
-    for msg in result["messages"]:
-        if hasattr(msg, "tool_calls") and msg.tool_calls:
-            for tc in msg.tool_calls:
-                if tc.get("name") == "sandbox":
-                    print("\n[Generated Code]:")
-                    code = tc.get("args", {}).get("code", "")
-                    print(code[:500] + "..." if len(code) > 500 else code)
-        if msg.__class__.__name__ == "AIMessage" and getattr(msg, "content", ""):
-            print(f"\nAssistant: {msg.content}")
+    _print_trace(result["messages"], max_code=500)
 
     print("\n" + "-" * 40)
     print("Example 1 completed!")
@@ -322,7 +375,6 @@ This example shows the LLM writing JavaScript to:
 
 def example_2_stock_screener() -> None:
     """Example 2: Stock screening with filtering and sorting."""
-    from langchain_openai import ChatOpenAI
     from langgraph.prebuilt import create_react_agent
     from amla_sandbox import create_sandbox_tool
 
@@ -331,21 +383,23 @@ def example_2_stock_screener() -> None:
     print("=" * 60)
     print("""
 This example shows the LLM writing JavaScript to:
-- Fetch data for multiple stocks in a loop
+- Fetch data for multiple stocks in one batch call
 - Filter based on criteria
 - Sort results
 - Use the VFS to store intermediate data
 """)
 
+    # batch=True lets the generated code fan out all 7 tickers x 3 lookups
+    # with a single `await batch([...])` instead of 21 sequential awaits.
     sandbox = create_sandbox_tool(
         tools=[get_stock_price, get_analyst_rating, get_company_info],
         max_calls=50,
+        batch=True,
+        # Static reference data; prices carry a timestamp so stay uncached.
+        cacheable={"get_company_info", "get_analyst_rating"},
     )
 
-    model = ChatOpenAI(
-        model=os.environ.get("OPENAI_MODEL", "gpt-5"),
-        temperature=0,
-    )
+    model = _get_model()
 
     agent: Any = create_react_agent(
         model, [sandbox.as_langchain_tool()], prompt=sandbox.get_system_prompt()
@@ -371,15 +425,7 @@ This example shows the LLM writing JavaScript to:
         config={"recursion_limit": 25},
     )
 
-    for msg in result["messages"]:
-        if hasattr(msg, "tool_calls") and msg.tool_calls:
-            for tc in msg.tool_calls:
-                if tc.get("name") == "sandbox":
-                    print("\n[Generated Code]:")
-                    code = tc.get("args", {}).get("code", "")
-                    print(code[:600] + "..." if len(code) > 600 else code)
-        if msg.__class__.__name__ == "AIMessage" and getattr(msg, "content", ""):
-            print(f"\nAssistant: {msg.content}")
+    _print_trace(result["messages"], max_code=600)
 
     print("\n" + "-" * 40)
     print("Example 2 completed!")
@@ -387,7 +433,6 @@ This example shows the LLM writing JavaScript to:
 
 def example_3_news_sentiment_analysis() -> None:
     """Example 3: News aggregation with sentiment analysis."""
-    from langchain_openai import ChatOpenAI
     from langgraph.prebuilt import create_react_agent
     from amla_sandbox import create_sandbox_tool
 
@@ -407,10 +452,7 @@ This example shows the LLM:
         max_calls=50,
     )
 
-    model = ChatOpenAI(
-        model=os.environ.get("OPENAI_MODEL", "gpt-5"),
-        temperature=0,
-    )
+    model = _get_model()
 
     agent: Any = create_react_agent(
         model, [sandbox.as_langchain_tool()], prompt=sandbox.get_system_prompt()
@@ -436,15 +478,7 @@ This example shows the LLM:
         config={"recursion_limit": 25},
     )
 
-    for msg in result["messages"]:
-        if hasattr(msg, "tool_calls") and msg.tool_calls:
-            for tc in msg.tool_calls:
-                if tc.get("name") == "sandbox":
-                    print("\n[Generated Code]:")
-                    code = tc.get("args", {}).get("code", "")
-                    print(code[:600] + "..." if len(code) > 600 else code)
-        if msg.__class__.__name__ == "AIMessage" and getattr(msg, "content", ""):
-            print(f"\nAssistant: {msg.content}")
+    _print_trace(result["messages"], max_code=600)
 
     print("\n" + "-" * 40)
     print("Example 3 completed!")
@@ -452,7 +486,6 @@ This example shows the LLM:
 
 def example_4_trading_strategy() -> None:
     """Example 4: Conditional trading based on analysis."""
-    from langchain_openai import ChatOpenAI
     from langgraph.prebuilt import create_react_agent
     from amla_sandbox import create_sandbox_tool
 
@@ -477,10 +510,7 @@ This example shows the LLM writing code that:
         },
     )
 
-    model = ChatOpenAI(
-        model=os.environ.get("OPENAI_MODEL", "gpt-5"),
-        temperature=0,
-    )
+    model = _get_model()
 
     agent: Any = create_react_agent(
         model, [sandbox.as_langchain_tool()], prompt=sandbox.get_system_prompt()
@@ -504,15 +534,7 @@ This example shows the LLM writing code that:
         config={"recursion_limit": 30},
     )
 
-    for msg in result["messages"]:
-        if hasattr(msg, "tool_calls") and msg.tool_calls:
-            for tc in msg.tool_calls:
-                if tc.get("name") == "sandbox":
-                    print("\n[Generated Code]:")
-                    code = tc.get("args", {}).get("code", "")
-                    print(code[:700] + "..." if len(code) > 700 else code)
-        if msg.__class__.__name__ == "AIMessage" and getattr(msg, "content", ""):
-            print(f"\nAssistant: {msg.content}")
+    _print_trace(result["messages"], max_code=700)
 
     print("\n" + "-" * 40)
     print("Example 4 completed!")
@@ -520,7 +542,6 @@ This example shows the LLM writing code that:
 
 def example_5_data_pipeline() -> None:
     """Example 5: Complex data pipeline with shell integration."""
-    from langchain_openai import ChatOpenAI
     from langgraph.prebuilt import create_react_agent
     from amla_sandbox import create_sandbox_tool
 
@@ -545,10 +566,7 @@ This example shows a full data pipeline:
         max_calls=50,
     )
 
-    model = ChatOpenAI(
-        model=os.environ.get("OPENAI_MODEL", "gpt-5"),
-        temperature=0,
-    )
+    model = _get_model()
 
     agent: Any = create_react_agent(
         model, [sandbox.as_langchain_tool()], prompt=sandbox.get_system_prompt()
@@ -575,16 +593,7 @@ This example shows a full data pipeline:
         config={"recursion_limit": 30},
     )
 
-    for msg in result["messages"]:
-        if hasattr(msg, "tool_calls") and msg.tool_calls:
-            for tc in msg.tool_calls:
-                if tc.get("name") == "sandbox":
-                    lang = tc.get("args", {}).get("language", "javascript")
-                    code = tc.get("args", {}).get("code", "")
-                    print(f"\n[Generated {lang.upper()}]:")
-                    print(code[:500] + "..." if len(code) > 500 else code)
-        if msg.__class__.__name__ == "AIMessage" and getattr(msg, "content", ""):
-            print(f"\nAssistant: {msg.content}")
+    _print_trace(result["messages"], max_code=500, show_language=True)
 
     print("\n" + "-" * 40)
     print("Example 5 completed!")
@@ -626,7 +635,7 @@ def main() -> None:
     print("=" * 60)
     print("LangGraph CodeAct: Complex Multi-Step Agents")
     print("=" * 60)
-    print(f"\nUsing model: {os.environ.get('OPENAI_MODEL', 'gpt-5')}")
+    print(f"\nUsing model: {_model_name()}")
     print("""
 These examples demonstrate the CodeAct pattern where the LLM writes
 JavaScript code to orchestrate multiple operations in a single turn.
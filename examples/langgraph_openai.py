@@ -10,45 +10,49 @@ Prerequisites:
 
 Run:
     python langgraph_openai.py              # Run all examples
+    python langgraph_openai.py --parallel   # Run all examples concurrently
     python langgraph_openai.py --example 1  # Run only example 1
     python langgraph_openai.py --list       # List available examples
 
 This example requires a valid OpenAI API key and will make actual API calls.
 """
 
-import argparse
+import functools
+import io
 import os
 import sys
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 from typing import Any
 
-from dotenv import load_dotenv
-
-# Load .env file (searches current dir and parents)
-load_dotenv()
-
-
 # =============================================================================
 # Tools for the Agent
 # =============================================================================
 
 
-def get_weather(city: str) -> dict[str, Any]:
-    """Get the current weather for a city.
-
-    Args:
-        city: The city name (e.g., "San Francisco", "Tokyo", "London")
-    """
-    weather_data = {
+_WEATHER = MappingProxyType(
+    {
         "san francisco": {"temp": 18, "condition": "foggy", "humidity": 75},
         "tokyo": {"temp": 25, "condition": "sunny", "humidity": 60},
         "london": {"temp": 12, "condition": "rainy", "humidity": 85},
         "new york": {"temp": 22, "condition": "partly cloudy", "humidity": 55},
         "paris": {"temp": 16, "condition": "cloudy", "humidity": 70},
     }
-    city_lower = city.lower()
-    data = weather_data.get(
-        city_lower, {"temp": 20, "condition": "unknown", "humidity": 50}
-    )
+)
+_DEFAULT_WEATHER = MappingProxyType(
+    {"temp": 20, "condition": "unknown", "humidity": 50}
+)
+
+
+def get_weather(city: str) -> dict[str, Any]:
+    """Get the current weather for a city.
+
+    Args:
+        city: The city name (e.g., "San Francisco", "Tokyo", "London")
+    """
+    data = _WEATHER.get(city.lower(), _DEFAULT_WEATHER)
     return {
         "city": city,
         "temperature_celsius": data["temp"],
@@ -57,6 +61,31 @@ def get_weather(city: str) -> dict[str, Any]:
     }
 
 
+_PRODUCTS: list[dict[str, str | float]] = [
+    {
+        "id": "p001",
+        "name": "Wireless Headphones",
+        "price": 79.99,
+        "category": "electronics",
+    },
+    {
+        "id": "p002",
+        "name": "Bluetooth Speaker",
+        "price": 49.99,
+        "category": "electronics",
+    },
+    {"id": "p003", "name": "USB-C Hub", "price": 39.99, "category": "electronics"},
+    {"id": "p004", "name": "Running Shoes", "price": 89.99, "category": "sports"},
+    {"id": "p005", "name": "Yoga Mat", "price": 29.99, "category": "sports"},
+    {"id": "p006", "name": "Water Bottle", "price": 19.99, "category": "sports"},
+]
+
+# Lowercased name/category per product, so searches don't re-lower them per call
+_PRODUCTS_SEARCH_TEXT = [
+    (p, str(p["name"]).lower(), str(p["category"]).lower()) for p in _PRODUCTS
+]
+
+
 def search_products(query: str, max_results: int = 3) -> dict[str, Any]:
     """Search for products in the catalog.
 
@@ -64,30 +93,11 @@ def search_products(query: str, max_results: int = 3) -> dict[str, Any]:
         query: Search terms (e.g., "electronics", "sports")
         max_results: Maximum number of results to return (default: 3)
     """
-    all_products: list[dict[str, str | float]] = [
-        {
-            "id": "p001",
-            "name": "Wireless Headphones",
-            "price": 79.99,
-            "category": "electronics",
-        },
-        {
-            "id": "p002",
-            "name": "Bluetooth Speaker",
-            "price": 49.99,
-            "category": "electronics",
-        },
-        {"id": "p003", "name": "USB-C Hub", "price": 39.99, "category": "electronics"},
-        {"id": "p004", "name": "Running Shoes", "price": 89.99, "category": "sports"},
-        {"id": "p005", "name": "Yoga Mat", "price": 29.99, "category": "sports"},
-        {"id": "p006", "name": "Water Bottle", "price": 19.99, "category": "sports"},
-    ]
-
     query_lower = query.lower()
     matching = [
         p
-        for p in all_products
-        if query_lower in str(p["name"]).lower() or query_lower in str(p["category"])
+        for p, name, category in _PRODUCTS_SEARCH_TEXT
+        if query_lower in name or query_lower in category
     ]
 
     return {
@@ -97,19 +107,23 @@ def search_products(query: str, max_results: int = 3) -> dict[str, Any]:
     }
 
 
+_STOCKS = MappingProxyType(
+    {
+        "AAPL": {"price": 178.50, "change": 2.30},
+        "GOOGL": {"price": 141.25, "change": -0.75},
+        "MSFT": {"price": 378.90, "change": 4.20},
+    }
+)
+
+
 def get_stock_price(symbol: str) -> dict[str, Any]:
     """Get the current stock price for a ticker symbol.
 
     Args:
         symbol: Stock ticker symbol (e.g., "AAPL", "GOOGL", "MSFT")
     """
-    stocks = {
-        "AAPL": {"price": 178.50, "change": 2.30},
-        "GOOGL": {"price": 141.25, "change": -0.75},
-        "MSFT": {"price": 378.90, "change": 4.20},
-    }
     symbol_upper = symbol.upper()
-    data = stocks.get(symbol_upper)
+    data = _STOCKS.get(symbol_upper)
     if data:
         return {"symbol": symbol_upper, **data}
     return {"symbol": symbol_upper, "error": "Symbol not found"}
@@ -120,9 +134,47 @@ def get_stock_price(symbol: str) -> dict[str, Any]:
 # =============================================================================
 
 
+@functools.lru_cache(maxsize=1)
+def _model_name() -> str:
+    """Resolve OPENAI_MODEL once (after .env has been loaded)."""
+    return os.environ.get("OPENAI_MODEL", "gpt-5")
+
+
+@functools.lru_cache(maxsize=1)
+def _get_model() -> Any:
+    """Create the chat model once, so every example reuses its HTTP client."""
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model=_model_name(),
+        temperature=0,
+    )
+
+
+def _preview(text: str, limit: int) -> str:
+    """Truncate ``text`` to ``limit`` characters, marking the cut with '...'."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def _stream_messages(agent: Any, query: str, *, recursion_limit: int) -> Iterator[Any]:
+    """Ask the agent a question, yielding new messages as each step finishes.
+
+    Uses ``stream_mode="updates"`` so generated code and answers can be
+    printed while the agent is still working, instead of after the run.
+    """
+    for update in agent.stream(
+        {"messages": [("user", query)]},
+        config={"recursion_limit": recursion_limit},
+        stream_mode="updates",
+    ):
+        for state in update.values():
+            if isinstance(state, dict):
+                yield from state.get("messages", [])
+
+
 def example_1_basic_sandbox() -> None:
     """Example 1: Basic code generation with sandbox tool."""
-    from langchain_openai import ChatOpenAI
+    from langchain_core.messages import AIMessage
     from langgraph.prebuilt import create_react_agent
     from amla_sandbox import create_sandbox_tool
 
@@ -133,36 +185,30 @@ def example_1_basic_sandbox() -> None:
     # Create sandbox with tools - they run in a secure WASM sandbox
     sandbox = create_sandbox_tool(tools=[get_weather], max_calls=10)
 
-    model = ChatOpenAI(
-        model=os.environ.get("OPENAI_MODEL", "gpt-5"),
-        temperature=0,
-    )
+    model = _get_model()
 
     # Use code generation - LLM writes JavaScript to call tools
+    system_prompt = sandbox.get_system_prompt()
     agent: Any = create_react_agent(
-        model, [sandbox.as_langchain_tool()], prompt=sandbox.get_system_prompt()
+        model, [sandbox.as_langchain_tool()], prompt=system_prompt
     )
 
     print("\nSystem prompt teaches LLM to write JavaScript:")
-    print(sandbox.get_system_prompt()[:300] + "...")
+    print(_preview(system_prompt, 300))
 
     print("\n" + "-" * 40)
     print("Query: Get the weather in Tokyo")
     print("-" * 40)
 
-    result = agent.invoke(
-        {"messages": [("user", "Get the weather in Tokyo")]},
-        config={"recursion_limit": 10},
-    )
-
-    for msg in result["messages"]:
-        if hasattr(msg, "tool_calls") and msg.tool_calls:
-            for tc in msg.tool_calls:
-                if tc.get("name") == "sandbox":
-                    print(
-                        f"\n[Generated JS]: {tc.get('args', {}).get('code', '')[:200]}..."
-                    )
-        if msg.__class__.__name__ == "AIMessage" and getattr(msg, "content", ""):
+    for msg in _stream_messages(agent, "Get the weather in Tokyo", recursion_limit=10):
+        if not isinstance(msg, AIMessage):
+            continue
+        for tc in msg.tool_calls:
+            if tc.get("name") == "sandbox":
+                print(
+                    f"\n[Generated JS]: {_preview(tc.get('args', {}).get('code', ''), 200)}"
+                )
+        if msg.content:
             print(f"\nAssistant: {msg.content}")
 
     print("\n" + "-" * 40)
@@ -171,7 +217,7 @@ def example_1_basic_sandbox() -> None:
 
 def example_2_multiple_tools() -> None:
     """Example 2: Multiple tools with code generation."""
-    from langchain_openai import ChatOpenAI
+    from langchain_core.messages import AIMessage
     from langgraph.prebuilt import create_react_agent
     from amla_sandbox import create_sandbox_tool
 
@@ -181,10 +227,7 @@ def example_2_multiple_tools() -> None:
 
     sandbox = create_sandbox_tool(tools=[get_weather, search_products], max_calls=20)
 
-    model = ChatOpenAI(
-        model=os.environ.get("OPENAI_MODEL", "gpt-5"),
-        temperature=0,
-    )
+    model = _get_model()
 
     # Code generation with multiple tools available
     agent: Any = create_react_agent(
@@ -199,23 +242,19 @@ def example_2_multiple_tools() -> None:
     print("Query: What's the weather in Paris and find me outdoor products?")
     print("-" * 40)
 
-    result = agent.invoke(
-        {
-            "messages": [
-                ("user", "What's the weather in Paris and find me outdoor products?")
-            ]
-        },
-        config={"recursion_limit": 15},
-    )
-
-    for msg in result["messages"]:
-        if hasattr(msg, "tool_calls") and msg.tool_calls:
-            for tc in msg.tool_calls:
-                if tc.get("name") == "sandbox":
-                    print(
-                        f"\n[Generated JS]: {tc.get('args', {}).get('code', '')[:300]}..."
-                    )
-        if msg.__class__.__name__ == "AIMessage" and getattr(msg, "content", ""):
+    for msg in _stream_messages(
+        agent,
+        "What's the weather in Paris and find me outdoor products?",
+        recursion_limit=15,
+    ):
+        if not isinstance(msg, AIMessage):
+            continue
+        for tc in msg.tool_calls:
+            if tc.get("name") == "sandbox":
+                print(
+                    f"\n[Generated JS]: {_preview(tc.get('args', {}).get('code', ''), 300)}"
+                )
+        if msg.content:
             print(f"\nAssistant: {msg.content}")
 
     print("\n" + "-" * 40)
@@ -224,7 +263,7 @@ def example_2_multiple_tools() -> None:
 
 def example_3_shell_mode() -> None:
     """Example 3: Using shell mode with language='shell'."""
-    from langchain_openai import ChatOpenAI
+    from langchain_core.messages import AIMessage
     from langgraph.prebuilt import create_react_agent
     from amla_sandbox import create_sandbox_tool
 
@@ -232,18 +271,18 @@ def example_3_shell_mode() -> None:
     print("Example 3: Shell Mode Execution")
     print("=" * 60)
 
-    sandbox = create_sandbox_tool(tools=[get_weather], max_calls=10)
+    sandbox = create_sandbox_tool(tools=[get_weather], max_calls=10, batch=True)
 
-    # First, let's create some data with JavaScript
+    # First, let's create some data with JavaScript. batch() fetches all
+    # three cities in one round trip instead of three sequential awaits.
     print("\nCreating test data with JavaScript...")
     result = sandbox.run(
         """
         const cities = ["Tokyo", "Paris", "London"];
-        const data = [];
-        for (const city of cities) {
-            const w = await get_weather({city});
-            data.push(w);
-        }
+        const results = await batch(
+            cities.map((city) => ({tool_name: "get_weather", args: {city}}))
+        );
+        const data = results.map((r) => r.value);
         await fs.writeFile("/workspace/weather.json", JSON.stringify(data, null, 2));
         console.log("Wrote weather data to /workspace/weather.json");
     """,
@@ -251,23 +290,23 @@ def example_3_shell_mode() -> None:
     )
     print(f"  {result}")
 
-    # Now use shell mode to process it
+    # Now use shell mode to process it: both pipelines in one run, with a
+    # marker line between their outputs
     print("\nProcessing with shell (language='shell')...")
     result = sandbox.run(
-        'cat /workspace/weather.json | jq ".[].city" | tr -d \'"\'', language="shell"
-    )
-    print(f"  Cities: {result}")
-
-    result = sandbox.run(
+        'cat /workspace/weather.json | jq ".[].city" | tr -d \'"\'; '
+        "echo ---HOT---; "
         'cat /workspace/weather.json | jq ".[] | .temperature_celsius" | sort -n | tail -1',
         language="shell",
     )
-    print(f"  Hottest temp: {result.strip()}C")
+    cities, marker, hottest = result.partition("---HOT---\n")
+    if marker:
+        print(f"  Cities: {cities}")
+        print(f"  Hottest temp: {hottest.strip()}C")
+    else:
+        print(f"  Expected a ---HOT--- marker in the shell output, got: {result!r}")
 
-    model = ChatOpenAI(
-        model=os.environ.get("OPENAI_MODEL", "gpt-5"),
-        temperature=0,
-    )
+    model = _get_model()
 
     # The system prompt now includes shell instructions
     agent: Any = create_react_agent(
@@ -278,21 +317,13 @@ def example_3_shell_mode() -> None:
     print("Query: Use shell to count the weather entries")
     print("-" * 40)
 
-    result = agent.invoke(
-        {
-            "messages": [
-                (
-                    "user",
-                    "Use the shell (language='shell') to count how many entries "
-                    "are in /workspace/weather.json using jq",
-                )
-            ]
-        },
-        config={"recursion_limit": 10},
-    )
-
-    for msg in result["messages"]:
-        if msg.__class__.__name__ == "AIMessage" and getattr(msg, "content", ""):
+    for msg in _stream_messages(
+        agent,
+        "Use the shell (language='shell') to count how many entries "
+        "are in /workspace/weather.json using jq",
+        recursion_limit=10,
+    ):
+        if isinstance(msg, AIMessage) and msg.content:
             print(f"\nAssistant: {msg.content}")
 
     print("\n" + "-" * 40)
@@ -301,7 +332,7 @@ def example_3_shell_mode() -> None:
 
 def example_4_with_constraints() -> None:
     """Example 4: Sandbox with constraints and rate limits."""
-    from langchain_openai import ChatOpenAI
+    from langchain_core.messages import AIMessage
     from langgraph.prebuilt import create_react_agent
     from amla_sandbox import create_sandbox_tool
 
@@ -326,10 +357,7 @@ def example_4_with_constraints() -> None:
     print("  - search_products: max 3 calls")
     print("  - get_stock_price: max 5 calls")
 
-    model = ChatOpenAI(
-        model=os.environ.get("OPENAI_MODEL", "gpt-5"),
-        temperature=0,
-    )
+    model = _get_model()
 
     # Use code generation - constraints enforced in WASM sandbox
     agent: Any = create_react_agent(
@@ -340,19 +368,17 @@ def example_4_with_constraints() -> None:
     print("Query: Search for sports products")
     print("-" * 40)
 
-    result = agent.invoke(
-        {"messages": [("user", "Search for sports products")]},
-        config={"recursion_limit": 15},
-    )
-
-    for msg in result["messages"]:
-        if hasattr(msg, "tool_calls") and msg.tool_calls:
-            for tc in msg.tool_calls:
-                if tc.get("name") == "sandbox":
-                    print(
-                        f"\n[Generated JS]: {tc.get('args', {}).get('code', '')[:300]}..."
-                    )
-        if msg.__class__.__name__ == "AIMessage" and getattr(msg, "content", ""):
+    for msg in _stream_messages(
+        agent, "Search for sports products", recursion_limit=15
+    ):
+        if not isinstance(msg, AIMessage):
+            continue
+        for tc in msg.tool_calls:
+            if tc.get("name") == "sandbox":
+                print(
+                    f"\n[Generated JS]: {_preview(tc.get('args', {}).get('code', ''), 300)}"
+                )
+        if msg.content:
             print(f"\nAssistant: {msg.content}")
 
     print("\n" + "-" * 40)
@@ -361,7 +387,7 @@ def example_4_with_constraints() -> None:
 
 def example_5_composable_prompt() -> None:
     """Example 5: Custom persona with composable system prompt."""
-    from langchain_openai import ChatOpenAI
+    from langchain_core.messages import AIMessage
     from langgraph.prebuilt import create_react_agent
     from amla_sandbox import create_sandbox_tool
 
@@ -371,10 +397,7 @@ def example_5_composable_prompt() -> None:
 
     sandbox = create_sandbox_tool(tools=[get_weather, search_products], max_calls=20)
 
-    model = ChatOpenAI(
-        model=os.environ.get("OPENAI_MODEL", "gpt-5"),
-        temperature=0,
-    )
+    model = _get_model()
 
     # Custom persona + sandbox instructions combined
     persona = """You are a helpful shopping assistant. You help users find products
@@ -389,7 +412,7 @@ When checking weather, consider:
 
     print("Composable prompt (persona + sandbox instructions):")
     print("-" * 40)
-    print(full_prompt[:400] + "...")
+    print(_preview(full_prompt, 400))
 
     # Use code generation with combined prompt
     agent: Any = create_react_agent(
@@ -400,26 +423,19 @@ When checking weather, consider:
     print("Query: Weather-based product recommendation")
     print("-" * 40)
 
-    result = agent.invoke(
-        {
-            "messages": [
-                (
-                    "user",
-                    "Check the weather in Tokyo and recommend products based on the conditions",
+    for msg in _stream_messages(
+        agent,
+        "Check the weather in Tokyo and recommend products based on the conditions",
+        recursion_limit=20,
+    ):
+        if not isinstance(msg, AIMessage):
+            continue
+        for tc in msg.tool_calls:
+            if tc.get("name") == "sandbox":
+                print(
+                    f"\n[Generated JS]: {_preview(tc.get('args', {}).get('code', ''), 300)}"
                 )
-            ]
-        },
-        config={"recursion_limit": 20},
-    )
-
-    for msg in result["messages"]:
-        if hasattr(msg, "tool_calls") and msg.tool_calls:
-            for tc in msg.tool_calls:
-                if tc.get("name") == "sandbox":
-                    print(
-                        f"\n[Generated JS]: {tc.get('args', {}).get('code', '')[:300]}..."
-                    )
-        if msg.__class__.__name__ == "AIMessage" and getattr(msg, "content", ""):
+        if msg.content:
             print(f"\nAssistant: {msg.content}")
 
     print("\n" + "-" * 40)
@@ -428,7 +444,7 @@ When checking weather, consider:
 
 def example_6_separate_tools() -> None:
     """Example 6: Separate JS and Shell tools (cleaner for LLM)."""
-    from langchain_openai import ChatOpenAI
+    from langchain_core.messages import AIMessage
     from langgraph.prebuilt import create_react_agent
     from amla_sandbox import create_sandbox_tool
 
@@ -436,59 +452,50 @@ def example_6_separate_tools() -> None:
     print("Example 6: Separate JS and Shell Tools")
     print("=" * 60)
 
-    # Create sandbox
+    # Create sandbox. batch=True lets the agent fetch Tokyo and Paris in one
+    # host round trip, and the separate-tools prompt tells it how.
     sandbox = create_sandbox_tool(
         tools=[get_weather, search_products],
         max_calls=20,
+        batch=True,
     )
 
     # Get separate tools instead of one combined tool
     tools = sandbox.as_langchain_tools()
     print(f"\nCreated {len(tools)} separate tools:")
     for tool in tools:
-        print(f"  - {tool.name}: {tool.description[:60]}...")
+        print(f"  - {tool.name}: {_preview(tool.description, 60)}")
 
-    model = ChatOpenAI(
-        model=os.environ.get("OPENAI_MODEL", "gpt-5"),
-        temperature=0,
-    )
+    model = _get_model()
 
     # Use the system prompt designed for separate tools
-    agent: Any = create_react_agent(
-        model, tools, prompt=sandbox.get_system_prompt_for_separate_tools()
-    )
+    system_prompt = sandbox.get_system_prompt_for_separate_tools()
+    agent: Any = create_react_agent(model, tools, prompt=system_prompt)
 
     print("\nSystem prompt (for separate tools):")
     print("-" * 40)
-    print(sandbox.get_system_prompt_for_separate_tools()[:400] + "...")
+    print(_preview(system_prompt, 400))
 
     print("\n" + "-" * 40)
     print("Query: Get weather in Tokyo and Paris, find hottest city")
     print("-" * 40)
 
-    result = agent.invoke(
-        {
-            "messages": [
-                (
-                    "user",
-                    "Get the weather in Tokyo and Paris, then tell me which city is hotter. "
-                    "Use JavaScript to fetch the data and shell to compare.",
-                )
-            ]
-        },
-        config={"recursion_limit": 15},
-    )
-
-    for msg in result["messages"]:
-        if hasattr(msg, "tool_calls") and msg.tool_calls:
-            for tc in msg.tool_calls:
-                tool_name = tc.get("name", "")
-                args = tc.get("args", {})
-                if tool_name == "sandbox_js":
-                    print(f"\n[JS Code]: {args.get('code', '')[:200]}...")
-                elif tool_name == "sandbox_shell":
-                    print(f"\n[Shell Command]: {args.get('command', '')}")
-        if msg.__class__.__name__ == "AIMessage" and getattr(msg, "content", ""):
+    for msg in _stream_messages(
+        agent,
+        "Get the weather in Tokyo and Paris, then tell me which city is hotter. "
+        "Use JavaScript to fetch the data and shell to compare.",
+        recursion_limit=15,
+    ):
+        if not isinstance(msg, AIMessage):
+            continue
+        for tc in msg.tool_calls:
+            tool_name = tc.get("name", "")
+            args = tc.get("args", {})
+            if tool_name == "sandbox_js":
+                print(f"\n[JS Code]: {_preview(args.get('code', ''), 200)}")
+            elif tool_name == "sandbox_shell":
+                print(f"\n[Shell Command]: {args.get('command', '')}")
+        if msg.content:
             print(f"\nAssistant: {msg.content}")
 
     print("\n" + "-" * 40)
@@ -510,24 +517,122 @@ EXAMPLES = {
 }
 
 
+class _PerThreadStream(io.TextIOBase):
+    """sys.stdout/sys.stderr stand-in that routes each thread to its own buffer.
+
+    contextlib.redirect_stdout swaps one process-wide sys.stdout, so it
+    cannot give concurrently running examples separate outputs. Threads
+    without a buffer of their own write to the original stream.
+    """
+
+    def __init__(self, stream: Any, buffers: dict[int, io.StringIO]) -> None:
+        self._stream = stream
+        self._buffers = buffers
+
+    def write(self, text: str) -> int:
+        return self._buffers.get(threading.get_ident(), self._stream).write(text)
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+
+def _run_examples_in_parallel(
+    examples: dict[int, tuple[str, Callable[[], None]]],
+) -> list[int]:
+    """Run examples concurrently, printing each one's output in order.
+
+    The examples spend nearly all their time waiting on OpenAI, so running
+    them side by side brings wall-clock time down to roughly the slowest
+    one. Each example's stdout and stderr are buffered so the walkthroughs
+    don't interleave. A failing example has its traceback printed with its
+    own output and does not stop the others.
+
+    Returns:
+        The numbers of the examples that failed.
+    """
+    import traceback
+
+    real_stdout, real_stderr = sys.stdout, sys.stderr
+    buffers: dict[int, io.StringIO] = {}
+
+    def capture(func: Callable[[], None]) -> tuple[str, bool]:
+        buffer = buffers[threading.get_ident()] = io.StringIO()
+        try:
+            func()
+        except Exception:  # noqa: BLE001 - reported with the example's output
+            traceback.print_exc()
+            return buffer.getvalue(), False
+        finally:
+            del buffers[threading.get_ident()]
+        return buffer.getvalue(), True
+
+    failed: list[int] = []
+    sys.stdout = _PerThreadStream(real_stdout, buffers)
+    sys.stderr = _PerThreadStream(real_stderr, buffers)
+    try:
+        with ThreadPoolExecutor(max_workers=len(examples)) as pool:
+            futures = [
+                (num, name, pool.submit(capture, func))
+                for num, (name, func) in examples.items()
+            ]
+            for num, name, future in futures:
+                output, ok = future.result()
+                print(f"\n{'=' * 60}", file=real_stdout)
+                print(f"Running example {num}: {name}", file=real_stdout)
+                print(output, end="", file=real_stdout, flush=True)
+                if not ok:
+                    failed.append(num)
+                    print(f"\nExample {num} failed", file=real_stdout)
+    finally:
+        sys.stdout, sys.stderr = real_stdout, real_stderr
+    return failed
+
+
+def _list_examples() -> None:
+    """Print the numbered example menu."""
+    print("Available examples:")
+    for num, (name, _) in EXAMPLES.items():
+        print(f"  {num}. {name}")
+
+
 def main() -> None:
+    # A bare --list needs no argument parsing; answer it before importing
+    # argparse. Anything else, including combined flags, goes through argparse.
+    if sys.argv[1:] in (["--list"], ["-l"]):
+        _list_examples()
+        return
+
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="LangGraph + OpenAI examples with amla-sandbox"
     )
-    parser.add_argument(
-        "--example", "-e", type=int, help="Run a specific example (1-6)"
-    )
+    # --parallel runs every example, so it can't be combined with --example
+    which = parser.add_mutually_exclusive_group()
+    which.add_argument("--example", "-e", type=int, help="Run a specific example (1-6)")
     parser.add_argument(
         "--list", "-l", action="store_true", help="List available examples"
     )
+    which.add_argument(
+        "--parallel",
+        "-p",
+        action="store_true",
+        help="Run all examples concurrently (output is shown per example)",
+    )
     args = parser.parse_args()
 
     if args.list:
-        print("Available examples:")
-        for num, (name, _) in EXAMPLES.items():
-            print(f"  {num}. {name}")
+        _list_examples()
         return
 
+    # Load .env file (searches current dir and parents). Deferred until here
+    # so --list doesn't pay for the directory walk, and skipped entirely when
+    # the environment already provides everything these examples read.
+    if not all(name in os.environ for name in ("OPENAI_API_KEY", "OPENAI_MODEL")):
+        from dotenv import load_dotenv
+
+        load_dotenv(override=False)
+
     # Check for API key
     if not os.environ.get("OPENAI_API_KEY"):
         print("Error: OPENAI_API_KEY not set")
@@ -540,7 +645,7 @@ def main() -> None:
     print("=" * 60)
     print("LangGraph + OpenAI: Real LLM Agent Examples")
     print("=" * 60)
-    print(f"\nUsing model: {os.environ.get('OPENAI_MODEL', 'gpt-5')}")
+    print(f"\nUsing model: {_model_name()}")
 
     try:
         if args.example:
@@ -551,6 +656,11 @@ def main() -> None:
             name, func = EXAMPLES[args.example]
             print(f"\nRunning example {args.example}: {name}")
             func()
+        elif args.parallel:
+            failed = _run_examples_in_parallel(EXAMPLES)
+            if failed:
+                print(f"\nError: examples {failed} failed")
+                sys.exit(1)
         else:
             # Run all examples
             for num, (name, func) in EXAMPLES.items():
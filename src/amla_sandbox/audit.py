@@ -195,37 +195,55 @@ class AuditCollector:
             except json.JSONDecodeError:
                 continue
 
-            # Parse timestamp
-            timestamp_str = raw.get("timestamp", "")
-            try:
-                timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-            except (ValueError, AttributeError):
-                timestamp = datetime.now()
-
-            entry = AuditEntry(
-                type=raw.get("type", "unknown"),
-                session_id=raw.get("session_id", ""),
-                timestamp=timestamp,
-                data=raw,
-                agent_id=self._config.agent_id,
-                trace_id=self._config.trace_id,
-                turn_id=self._turn_id,
-            )
-
-            # Apply custom enricher
-            if self._config.custom_enricher:
-                entry.data = self._config.custom_enricher(entry.data)
-
-            entries.append(entry)
-            self._entries.append(entry)
-
-            # Write to file if configured
-            if self._file:
-                self._file.write(entry.to_jsonl() + "\n")
-                self._file.flush()
+            entries.append(self.record(raw))
 
         return entries
 
+    def record(self, raw: dict[str, Any]) -> AuditEntry:
+        """Enrich and store one raw audit event.
+
+        Runtime events arrive here from ``drain_from_runtime()``. The host
+        also reports events the WASM runtime never sees this way, such as
+        tool calls it dispatches itself (``Sandbox.try_call()``, the inner
+        calls of a ``batch`` tool).
+
+        Args:
+            raw: Event fields in the runtime's JSONL schema. ``type``,
+                ``session_id`` and an RFC 3339 ``timestamp`` are read from it.
+
+        Returns:
+            The enriched audit entry.
+        """
+        # Parse timestamp
+        timestamp_str = raw.get("timestamp", "")
+        try:
+            timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
+        except (ValueError, AttributeError):
+            timestamp = datetime.now()
+
+        entry = AuditEntry(
+            type=raw.get("type", "unknown"),
+            session_id=raw.get("session_id", ""),
+            timestamp=timestamp,
+            data=raw,
+            agent_id=self._config.agent_id,
+            trace_id=self._config.trace_id,
+            turn_id=self._turn_id,
+        )
+
+        # Apply custom enricher
+        if self._config.custom_enricher:
+            entry.data = self._config.custom_enricher(entry.data)
+
+        self._entries.append(entry)
+
+        # Write to file if configured
+        if self._file:
+            self._file.write(entry.to_jsonl() + "\n")
+            self._file.flush()
+
+        return entry
+
     def new_turn(self) -> None:
         """Mark the start of a new agent turn.
 
@@ -33,22 +33,38 @@ to get started. They just get a sandbox that's safer than subprocess.
 
 from __future__ import annotations
 
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Collection
 from typing import Any, Callable, Sequence, cast
 
 from .capabilities import Constraint, ConstraintSet, MethodCapability
 from .sandbox import Sandbox
 from .tools import capability_from_function, tool_from_function
+from .tools.handlers import (
+    BATCH_TOOL_NAME,
+    BatchHandler,
+    batch_tool_definition,
+    create_batch_handler,
+)
 from .langgraph import SandboxTool
 
 # Default call limit per tool when none specified
 DEFAULT_MAX_CALLS = 100
 
+# Distinct argument sets whose results each cacheable tool keeps. Arguments
+# come from sandboxed code, so the cache is an LRU rather than unbounded.
+CACHEABLE_RESULTS_SIZE = 256
+
 
 def create_sandbox_tool(
     tools: Sequence[Callable[..., Any]] | None = None,
     *,
     constraints: dict[str, dict[str, Any]] | None = None,
     max_calls: int | dict[str, int] | None = None,
+    batch: bool = False,
+    cacheable: Collection[str] | None = None,
 ) -> SandboxTool:
     """Create a sandbox tool for AI agents.
 
@@ -66,6 +82,21 @@ def create_sandbox_tool(
         max_calls: Maximum calls allowed. Can be:
             - int: Same limit for all tools
             - dict: Per-tool limits {"transfer_money": 10}
+        batch: Also expose a ``batch`` tool that runs several tool calls
+            concurrently on the host: ``await batch([{tool_name, args}, ...])``.
+            Each inner call is checked against the PCA, counted against its
+            own tool's constraints and max_calls, and audited; the batch call
+            itself is limited by ``max_calls`` like any other tool. At most
+            ``TOOL_CONCURRENCY_LIMIT`` (env, default 8) calls run at once.
+            Sync tools run on a worker pool; ``async def`` tools are
+            gathered on one shared event loop. ``sandbox.close()`` shuts
+            both down.
+        cacheable: Names of deterministic tools whose results may be reused.
+            Repeated calls with the same arguments return the first result
+            without running the function again. Calls are still checked
+            and counted against max_calls. Each tool keeps the results of
+            its ``CACHEABLE_RESULTS_SIZE`` most recently used argument sets.
+            Leave out anything with side effects or time-dependent output.
 
     Returns:
         LangChain/LangGraph compatible SandboxTool.
@@ -80,9 +111,22 @@ def create_sandbox_tool(
         # With tools
         sandbox = create_sandbox_tool(tools=[get_weather, search_db])
         result = sandbox.run("const w = await get_weather({city: 'SF'});", language="javascript")
+
+        # Fan out independent calls in one round trip
+        sandbox = create_sandbox_tool(tools=[get_weather], batch=True)
+        result = sandbox.run(
+            "const [sf, ny] = await batch(["
+            "{tool_name: 'get_weather', args: {city: 'SF'}},"
+            "{tool_name: 'get_weather', args: {city: 'NY'}}]);",
+            language="javascript",
+        )
     """
     tools_list = list(tools) if tools else []
     tool_map = {func.__name__: func for func in tools_list}
+    dispatch = {
+        name: _memoize(func) if cacheable and name in cacheable else func
+        for name, func in tool_map.items()
+    }
 
     # Convert functions to ToolDefinitions
     tool_defs = [tool_from_function(func) for func in tools_list]
@@ -90,13 +134,34 @@ def create_sandbox_tool(
     # Build capabilities with constraints
     caps = _build_capabilities(tools_list, constraints, max_calls)
 
+    batch_handler: BatchHandler | None = None
+    if batch and tools_list:
+        tool_defs.append(batch_tool_definition())
+        caps.append(
+            MethodCapability(
+                method_pattern=f"mcp:{BATCH_TOOL_NAME}",
+                max_calls=_limit_for(BATCH_TOOL_NAME, max_calls),
+            )
+        )
+        # Inner calls are authorized against the sandbox's own budgets,
+        # so the sandbox has to exist before the first batch runs.
+        batch_handler = create_batch_handler(
+            dispatch,
+            lambda method, params: sandbox.authorize_call(
+                method, params, via=f"mcp:{BATCH_TOOL_NAME}"
+            ),
+        )
+
     # Create handler
     def handler(method: str, params: dict[str, Any]) -> Any:
         # Strip mcp: prefix if present (WASM runtime adds it internally)
         name = method.removeprefix("mcp:")
-        if name not in tool_map:
+        func = dispatch.get(name)
+        if func is None:
+            if name == BATCH_TOOL_NAME and batch_handler is not None:
+                return batch_handler(params)
             raise ValueError(f"Unknown tool: '{name}'")
-        return tool_map[name](**params)
+        return func(**params)
 
     # Create sandbox
     sandbox = Sandbox(
@@ -104,6 +169,8 @@ def create_sandbox_tool(
         capabilities=caps,
         tool_handler=handler if tools_list else None,
     )
+    if batch_handler is not None:
+        sandbox.add_cleanup(batch_handler.close)
 
     return SandboxTool(
         sandbox=sandbox,
@@ -127,25 +194,55 @@ def _build_capabilities(
         tool_constraints = constraints.get(name, {}) if constraints else {}
         constraint_set = _parse_constraints(tool_constraints)
 
-        # Get max_calls for this tool
-        if max_calls is None:
-            limit = DEFAULT_MAX_CALLS
-        elif isinstance(max_calls, int):
-            limit = max_calls
-        else:
-            limit = max_calls.get(name, DEFAULT_MAX_CALLS)
-
         # Create capability
         cap = capability_from_function(
             func,
             constraints=constraint_set if not constraint_set.is_empty() else None,
-            max_calls=limit,
+            max_calls=_limit_for(name, max_calls),
         )
         caps.append(cap)
 
     return caps
 
 
+def _memoize(
+    func: Callable[..., Any], maxsize: int = CACHEABLE_RESULTS_SIZE
+) -> Callable[..., Any]:
+    """Wrap a tool so repeated calls with equal arguments reuse its result.
+
+    Arguments arrive as JSON from the sandbox, so their canonical JSON
+    encoding is the cache key. At most ``maxsize`` results are kept, least
+    recently used first out. Exceptions are not cached.
+    """
+    results: OrderedDict[str, Any] = OrderedDict()
+    # Batch calls run on a worker pool, so the LRU bookkeeping is locked
+    lock = threading.Lock()
+
+    def cached(**kwargs: Any) -> Any:
+        key = json.dumps(kwargs, sort_keys=True, separators=(",", ":"), default=repr)
+        with lock:
+            if key in results:
+                results.move_to_end(key)
+                return results[key]
+        result = func(**kwargs)
+        with lock:
+            results[key] = result
+            if len(results) > maxsize:
+                results.popitem(last=False)
+        return result
+
+    return cached
+
+
+def _limit_for(name: str, max_calls: int | dict[str, int] | None) -> int:
+    """Resolve the max_calls setting for one tool."""
+    if max_calls is None:
+        return DEFAULT_MAX_CALLS
+    if isinstance(max_calls, int):
+        return max_calls
+    return max_calls.get(name, DEFAULT_MAX_CALLS)
+
+
 def _parse_constraints(spec: dict[str, Any]) -> ConstraintSet:
     """Parse constraint dict into ConstraintSet.
 
@@ -31,8 +31,11 @@ Example::
 
 from __future__ import annotations
 
+import operator
+import threading
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
-from typing import Any, Literal, cast
+from typing import Any, Literal, NoReturn, cast
 
 
 class ConstraintError(Exception):
@@ -89,6 +92,23 @@ ConstraintType = Literal[
     "or",
 ]
 
+ConstraintPredicate = Callable[[dict[str, Any]], bool]
+"""A compiled constraint: returns True if the parameters pass."""
+
+# Bumped whenever a constraint or constraint set is changed after
+# construction. Compiled predicates record the generation they were built
+# in, so a change anywhere (including inside a nested And/Or) invalidates
+# them without any per-call comparison of the constraint tree.
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def _invalidate_compiled() -> None:
+    """Mark every compiled predicate as stale."""
+    global _generation
+    with _generation_lock:
+        _generation += 1
+
 
 @dataclass
 class Constraint:
@@ -118,11 +138,26 @@ class Constraint:
     type: ConstraintType
     param: str = ""
     value: Any = None
-    values: list[Any] = field(default_factory=lambda: [])
+    values: tuple[Any, ...] = ()
     prefix: str = ""
     suffix: str = ""
     substring: str = ""
-    constraints: list[Constraint] = field(default_factory=lambda: [])
+    constraints: tuple[Constraint, ...] = ()
+    # Cached predicate and the generation it was built in
+    _compiled: tuple[int, ConstraintPredicate] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Stored as tuples so they can only change by assignment, which
+        # is seen here
+        if name in ("values", "constraints"):
+            value = tuple(value)
+        # _compiled is the last attribute __init__ sets, so a field write
+        # after it is a change to a constraint that may already be compiled
+        if name != "_compiled" and "_compiled" in self.__dict__:
+            _invalidate_compiled()
+        object.__setattr__(self, name, value)
 
     # Factory methods for each constraint type
 
@@ -159,12 +194,12 @@ class Constraint:
     @classmethod
     def is_in(cls, param: str, values: list[Any]) -> Constraint:
         """Create a set membership constraint."""
-        return cls(type="in", param=param, values=list(values))
+        return cls(type="in", param=param, values=tuple(values))
 
     @classmethod
     def not_in(cls, param: str, values: list[Any]) -> Constraint:
         """Create a set exclusion constraint."""
-        return cls(type="not_in", param=param, values=list(values))
+        return cls(type="not_in", param=param, values=tuple(values))
 
     @classmethod
     def starts_with(cls, param: str, prefix: str) -> Constraint:
@@ -194,12 +229,12 @@ class Constraint:
     @classmethod
     def and_(cls, constraints: list[Constraint]) -> Constraint:
         """Create a conjunction constraint (all must pass)."""
-        return cls(type="and", constraints=list(constraints))
+        return cls(type="and", constraints=tuple(constraints))
 
     @classmethod
     def or_(cls, constraints: list[Constraint]) -> Constraint:
         """Create a disjunction constraint (at least one must pass)."""
-        return cls(type="or", constraints=list(constraints))
+        return cls(type="or", constraints=tuple(constraints))
 
     def evaluate(self, params: dict[str, Any]) -> None:
         """Evaluate this constraint against the given parameters.
@@ -210,109 +245,171 @@ class Constraint:
         Raises:
             ConstraintError: If the constraint fails
         """
-        if self.type == "exists":
-            if _get_param_opt(params, self.param) is None:
-                raise MissingParamError(self.param)
-            return
+        if not self.predicate()(params):
+            self._raise_violation(params)
 
-        if self.type == "not_exists":
-            val = _get_param_opt(params, self.param)
-            if val is not None:
-                raise ViolationError(self.param, "must not exist", repr(val))
-            return
+    def predicate(self) -> ConstraintPredicate:
+        """Compile this constraint into a boolean predicate.
 
-        if self.type == "lt":
-            actual = _get_param(params, self.param)
-            if not _compare_lt(actual, self.value):
-                raise ViolationError(self.param, f"< {self.value!r}", repr(actual))
-            return
+        The constraint type is dispatched once here instead of on every
+        evaluation, and its operands and parameter lookup are bound into
+        the returned closure. Missing parameters and wrong types make the
+        predicate return False rather than raise (fail-closed).
 
-        if self.type == "le":
-            actual = _get_param(params, self.param)
-            if not _compare_le(actual, self.value):
-                raise ViolationError(self.param, f"<= {self.value!r}", repr(actual))
-            return
+        The closure is cached on the constraint and rebuilt after any
+        constraint has been changed.
 
-        if self.type == "gt":
-            actual = _get_param(params, self.param)
-            if not _compare_gt(actual, self.value):
-                raise ViolationError(self.param, f"> {self.value!r}", repr(actual))
-            return
+        Returns:
+            A function that takes the parameters and returns True if the
+            constraint passes
 
-        if self.type == "ge":
-            actual = _get_param(params, self.param)
-            if not _compare_ge(actual, self.value):
-                raise ViolationError(self.param, f">= {self.value!r}", repr(actual))
-            return
+        Raises:
+            ValueError: If the constraint type is unknown
+        """
+        compiled = self._compiled
+        if compiled is not None and compiled[0] == _generation:
+            return compiled[1]
+        generation = _generation
+        test = self._build_predicate()
+        self._compiled = (generation, test)
+        return test
+
+    def _build_predicate(self) -> ConstraintPredicate:
+        """Build the closure that ``predicate()`` caches."""
+        if self.type == "and":
+            tests = tuple(c.predicate() for c in self.constraints)
 
-        if self.type == "eq":
-            actual = _get_param(params, self.param)
-            if actual != self.value:
-                raise ViolationError(self.param, f"== {self.value!r}", repr(actual))
-            return
+            def test(params: dict[str, Any]) -> bool:
+                for t in tests:
+                    if not t(params):
+                        return False
+                return True
 
-        if self.type == "ne":
-            actual = _get_param(params, self.param)
-            if actual == self.value:
-                raise ViolationError(self.param, f"!= {self.value!r}", repr(actual))
-            return
+            return test
 
-        if self.type == "in":
-            actual = _get_param(params, self.param)
-            if actual not in self.values:
-                raise ViolationError(self.param, f"in {self.values!r}", repr(actual))
-            return
+        if self.type == "or":
+            tests = tuple(c.predicate() for c in self.constraints)
 
-        if self.type == "not_in":
-            actual = _get_param(params, self.param)
-            if actual in self.values:
-                raise ViolationError(
-                    self.param, f"not in {self.values!r}", repr(actual)
-                )
-            return
+            def test(params: dict[str, Any]) -> bool:
+                for t in tests:
+                    if t(params):
+                        return True
+                return False  # An empty Or never matches
+
+            return test
+
+        get = _param_getter(self.param)
+
+        if self.type == "exists":
+            return lambda params: get(params) is not None
+
+        if self.type == "not_exists":
+            return lambda params: get(params) is None
+
+        if self.type in _COMPARISONS:
+            compare = _COMPARISONS[self.type][0]
+            value = self.value
+
+            def test(params: dict[str, Any]) -> bool:
+                actual = get(params)
+                return actual is not None and compare(actual, value)
+
+            return test
+
+        if self.type in ("in", "not_in"):
+            values = self.values
+            negate = self.type == "not_in"
+            try:
+                members: frozenset[Any] | tuple[Any, ...] = frozenset(values)
+            except TypeError:
+                members = values  # Unhashable values: fall back to a scan
+
+            def test(params: dict[str, Any]) -> bool:
+                actual = get(params)
+                if actual is None:
+                    return False
+                try:
+                    found = actual in members
+                except TypeError:  # Unhashable parameter value
+                    found = actual in values
+                return found != negate
+
+            return test
 
         if self.type == "starts_with":
-            actual = _get_param_string(params, self.param)
-            if not actual.startswith(self.prefix):
-                raise ViolationError(self.param, f'starts with "{self.prefix}"', actual)
-            return
+            prefix = self.prefix
+            return lambda params: _is_str_and(get(params), str.startswith, prefix)
 
         if self.type == "ends_with":
-            actual = _get_param_string(params, self.param)
-            if not actual.endswith(self.suffix):
-                raise ViolationError(self.param, f'ends with "{self.suffix}"', actual)
-            return
+            suffix = self.suffix
+            return lambda params: _is_str_and(get(params), str.endswith, suffix)
 
         if self.type == "contains":
-            actual = _get_param_string(params, self.param)
-            if self.substring not in actual:
-                raise ViolationError(self.param, f'contains "{self.substring}"', actual)
-            return
+            substring = self.substring
+            return lambda params: _is_str_and(get(params), str.__contains__, substring)
+
+        raise ValueError(f"Unknown constraint type: {self.type}")
+
+    def _raise_violation(self, params: dict[str, Any]) -> NoReturn:
+        """Raise the error for parameters this constraint's predicate rejected.
+
+        Only runs on the failure path, so it can afford to walk the
+        constraint again to find out why it failed.
+        """
+        param = self.param
 
         if self.type == "and":
             for c in self.constraints:
                 c.evaluate(params)
-            return
 
-        if self.type == "or":
+        elif self.type == "or":
             if not self.constraints:
                 raise ViolationError(
                     "(or)", "at least one constraint must match", "empty Or"
                 )
-
-            last_error: ConstraintError | None = None
-            for c in self.constraints:
+            for c in self.constraints[:-1]:
                 try:
                     c.evaluate(params)
-                    return  # At least one passed
-                except ConstraintError as e:
-                    last_error = e
+                except ConstraintError:
+                    pass
+            self.constraints[-1].evaluate(params)
 
-            if last_error:
-                raise last_error
-            return
+        elif self.type == "exists":
+            raise MissingParamError(param)
 
-        raise ValueError(f"Unknown constraint type: {self.type}")
+        elif self.type == "not_exists":
+            raise ViolationError(
+                param, "must not exist", repr(_get_param_opt(params, param))
+            )
+
+        elif self.type in ("starts_with", "ends_with", "contains"):
+            raise ViolationError(param, self._rule(), _get_param_string(params, param))
+
+        else:
+            raise ViolationError(param, self._rule(), repr(_get_param(params, param)))
+
+        # Only reachable if the predicate and the slow path disagree
+        raise ViolationError(param or f"({self.type})", self._rule(), "rejected")
+
+    def _rule(self) -> str:
+        """Describe this constraint's rule for violation messages."""
+        if self.type in _COMPARISONS:
+            return f"{_COMPARISONS[self.type][1]} {self.value!r}"
+        if self.type in ("in", "not_in"):
+            return (
+                f"{'not in' if self.type == 'not_in' else 'in'} {list(self.values)!r}"
+            )
+        if self.type == "starts_with":
+            return f'starts with "{self.prefix}"'
+        if self.type == "ends_with":
+            return f'ends with "{self.suffix}"'
+        if self.type == "contains":
+            return f'contains "{self.substring}"'
+        if self.type == "not_exists":
+            return "must not exist"
+        if self.type == "or":
+            return "at least one constraint must match"
+        return "must hold"
 
     def subsumes(self, other: Constraint) -> bool:
         """Check if this constraint subsumes another (this >= other).
@@ -441,10 +538,24 @@ class ConstraintSet:
     All constraints must pass for the set to pass.
     """
 
-    constraints: list[Constraint] = field(default_factory=lambda: [])
-
-    def __init__(self, constraints: list[Constraint] | None = None) -> None:
-        self.constraints = list(constraints) if constraints else []
+    constraints: tuple[Constraint, ...] = ()
+    # Combined predicate and the generation it was built in
+    _compiled: tuple[int, ConstraintPredicate] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __init__(self, constraints: Iterable[Constraint] | None = None) -> None:
+        self.constraints = tuple(constraints) if constraints else ()
+        self._compiled = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Same scheme as Constraint: a tuple that only changes by
+        # assignment, and assignment invalidates compiled predicates
+        if name == "constraints":
+            value = tuple(value)
+        if name != "_compiled" and "_compiled" in self.__dict__:
+            _invalidate_compiled()
+        object.__setattr__(self, name, value)
 
     def is_empty(self) -> bool:
         """Returns True if the constraint set is empty."""
@@ -462,8 +573,52 @@ class ConstraintSet:
         Raises:
             ConstraintError: If any constraint fails
         """
-        for constraint in self.constraints:
-            constraint.evaluate(params)
+        if self.allows(params):
+            return
+        # Failure path: walk the constraints to report the first violation
+        for c in self.constraints:
+            c.evaluate(params)
+
+    def allows(self, params: dict[str, Any]) -> bool:
+        """Check whether the parameters satisfy all constraints.
+
+        Same outcome as ``evaluate()``, but returns False instead of
+        raising, and never builds an error message.
+
+        Args:
+            params: Dictionary of parameters
+
+        Returns:
+            True if every constraint passes
+        """
+        compiled = self._compiled
+        if compiled is None or compiled[0] != _generation:
+            compiled = self._compile()
+        return compiled[1](params)
+
+    def _compile(self) -> tuple[int, ConstraintPredicate]:
+        """Combine the constraints' predicates into one and cache it."""
+        generation = _generation
+        tests = tuple(c.predicate() for c in self.constraints)
+
+        if not tests:
+
+            def test(params: dict[str, Any]) -> bool:
+                return True
+
+        elif len(tests) == 1:
+            test = tests[0]
+
+        else:
+
+            def test(params: dict[str, Any]) -> bool:
+                for t in tests:
+                    if not t(params):
+                        return False
+                return True
+
+        self._compiled = compiled = (generation, test)
+        return compiled
 
     def subsumes(self, child: ConstraintSet) -> bool:
         """Check if this constraint set subsumes another (for attenuation).
@@ -506,7 +661,7 @@ class ConstraintSet:
 
     def extend(self, other: ConstraintSet) -> None:
         """Merge another constraint set into this one (conjunction)."""
-        self.constraints.extend(other.constraints)
+        self.constraints += other.constraints
 
     def merge(self, other: ConstraintSet) -> ConstraintSet:
         """Create a new constraint set by merging two sets."""
@@ -632,6 +787,28 @@ def _get_param_opt(params: dict[str, Any], path: str) -> Any:
     return current
 
 
+def _param_getter(path: str) -> Callable[[dict[str, Any]], Any]:
+    """Build a lookup equivalent to ``_get_param_opt(params, path)``.
+
+    Top-level names skip the path parsing and become a plain dict lookup.
+    """
+    name = path.removeprefix("/")
+    if "/" in name:
+        return lambda params: _get_param_opt(params, path)
+
+    def get(params: dict[str, Any]) -> Any:
+        if isinstance(params, dict):
+            return params.get(name)
+        return _get_param_opt(params, path)
+
+    return get
+
+
+def _is_str_and(val: Any, op: Callable[[str, str], bool], operand: str) -> bool:
+    """Apply a string operation, failing for non-string values."""
+    return isinstance(val, str) and op(val, operand)
+
+
 def _get_param_string(params: dict[str, Any], path: str) -> str:
     """Get a parameter value as string, raising if wrong type."""
     val = _get_param(params, path)
@@ -666,3 +843,14 @@ def _compare_gt(a: Any, b: Any) -> bool:
 def _compare_ge(a: Any, b: Any) -> bool:
     """Compare two values for greater-than-or-equal."""
     return a == b or _compare_gt(a, b)
+
+
+# Comparison constraint types: (compare function, operator shown in errors)
+_COMPARISONS: dict[str, tuple[Callable[[Any, Any], bool], str]] = {
+    "lt": (_compare_lt, "<"),
+    "le": (_compare_le, "<="),
+    "gt": (_compare_gt, ">"),
+    "ge": (_compare_ge, ">="),
+    "eq": (operator.eq, "=="),
+    "ne": (operator.ne, "!="),
+}
@@ -62,7 +62,7 @@ class CallLimitExceededError(CapabilityError):
 METHOD_CAPABILITY_TYPE = "method"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MethodCapability:
     """Capability protecting JSON-RPC method calls.
 
@@ -80,6 +80,16 @@ class MethodCapability:
         The capability key is derived from the method pattern:
         ``cap:method:{pattern}`` (e.g., ``cap:method:stripe/charges/*``)
 
+    Capabilities are immutable, so a runtime can cache what it derives from
+    them (keys, per-method matches, compiled constraints). To change a
+    grant, build a new capability, e.g. with ``dataclasses.replace()``.
+    Assigning to a field raises ``dataclasses.FrozenInstanceError``; earlier
+    releases allowed it.
+
+    Capabilities are hashable. The hash covers ``method_pattern`` and
+    ``max_calls`` only, since constraint sets and schemas are mutable
+    containers; equality still compares every field.
+
     Attributes:
         method_pattern: Glob pattern for method names (e.g., "stripe/charges/*")
         constraints: Parameter constraints (all must pass)
@@ -88,9 +98,9 @@ class MethodCapability:
     """
 
     method_pattern: str
-    constraints: ConstraintSet = field(default_factory=ConstraintSet)
+    constraints: ConstraintSet = field(default_factory=ConstraintSet, hash=False)
     max_calls: int | None = None
-    input_schema: dict[str, Any] | None = None
+    input_schema: dict[str, Any] | None = field(default=None, hash=False)
 
     def key(self) -> str:
         """Get the capability key derived from the method pattern.
@@ -240,7 +250,7 @@ def _constraint_to_dict(c: Any) -> dict[str, Any]:
     if c.value is not None:
         result["value"] = c.value
     if c.values:
-        result["values"] = c.values
+        result["values"] = list(c.values)
     if c.prefix:
         result["prefix"] = c.prefix
     if c.suffix:
@@ -263,9 +273,9 @@ def _dict_to_constraint(data: dict[str, Any]) -> Any:
         type=constraint_type,
         param=data.get("param", ""),
         value=data.get("value"),
-        values=data.get("values", []),
+        values=tuple(data.get("values", ())),
         prefix=data.get("prefix", ""),
         suffix=data.get("suffix", ""),
         substring=data.get("substring", ""),
-        constraints=[_dict_to_constraint(c) for c in data.get("constraints", [])],
+        constraints=tuple(_dict_to_constraint(c) for c in data.get("constraints", [])),
     )
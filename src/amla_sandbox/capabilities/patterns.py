@@ -58,6 +58,11 @@ def method_matches_pattern(method: str, pattern: str) -> bool:
         >>> method_matches_pattern("stripe", "stripe/**")
         True
     """
+    # Without a wildcard every segment must match literally, which is
+    # plain string equality - skip the split and recursive walk
+    if "*" not in pattern:
+        return method == pattern
+
     # Handle empty string specially - it has zero segments
     method_parts = [] if method == "" else method.split("/")
     pattern_parts = [] if pattern == "" else pattern.split("/")
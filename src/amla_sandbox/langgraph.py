@@ -54,6 +54,7 @@ from .tools import (
     capability_from_function,
     tool_from_function,
 )
+from .tools.handlers import BATCH_TOOL_NAME
 
 
 @dataclass
@@ -198,7 +199,11 @@ Set language="shell" to run shell commands with:
         )
 
     def execute(
-        self, code: str, *, stdin: str | bytes | None = None
+        self,
+        code: str,
+        *,
+        stdin: str | bytes | None = None,
+        on_output: Callable[[str], None] | None = None,
     ) -> ExecutionResult:
         """Execute JavaScript code in the sandbox.
 
@@ -206,12 +211,14 @@ Set language="shell" to run shell commands with:
             code: JavaScript code to execute.
             stdin: Optional code to pipe via stdin (bypasses command size limits).
                 If provided, code parameter is ignored and stdin is executed.
+            on_output: Optional callback receiving stdout chunks as the script
+                produces them, e.g. to show progress between tool calls.
 
         Returns:
             ExecutionResult with stdout, stderr, and any errors.
         """
         try:
-            output = self.sandbox.execute(code, stdin=stdin)
+            output = self.sandbox.execute(code, on_output, stdin=stdin)
             return ExecutionResult(
                 stdout=output,
                 stderr=self.sandbox.last_stderr,
@@ -225,19 +232,25 @@ Set language="shell" to run shell commands with:
             )
 
     def shell(
-        self, command: str, *, stdin: str | bytes | None = None
+        self,
+        command: str,
+        *,
+        stdin: str | bytes | None = None,
+        on_output: Callable[[str], None] | None = None,
     ) -> ExecutionResult:
         """Execute a shell command in the sandbox.
 
         Args:
             command: Shell command to execute.
             stdin: Optional data to pipe via stdin.
+            on_output: Optional callback receiving stdout chunks as they
+                are produced.
 
         Returns:
             ExecutionResult with stdout, stderr, and any errors.
         """
         try:
-            output = self.sandbox.shell(command, stdin=stdin)
+            output = self.sandbox.shell(command, stdin=stdin, on_output=on_output)
             return ExecutionResult(
                 stdout=output,
                 stderr=self.sandbox.last_stderr,
@@ -256,6 +269,7 @@ Set language="shell" to run shell commands with:
         language: str,
         *,
         stdin: str | bytes | None = None,
+        on_output: Callable[[str], None] | None = None,
     ) -> str:
         """Execute code and return string result.
 
@@ -266,16 +280,58 @@ Set language="shell" to run shell commands with:
             language: Either "javascript" or "shell".
             stdin: Optional data to pipe via stdin. For JavaScript, this bypasses
                 the command size limit. For shell, useful for piping to `sh`.
+            on_output: Optional callback receiving stdout chunks while the
+                code runs. The full output is still returned at the end.
 
         Returns:
             String output suitable for LLM consumption.
         """
         if language == "shell":
-            result = self.shell(code, stdin=stdin)
+            result = self.shell(code, stdin=stdin, on_output=on_output)
         else:
-            result = self.execute(code, stdin=stdin)
+            result = self.execute(code, stdin=stdin, on_output=on_output)
         return result.to_tool_message()
 
+    def with_language(self, language: str) -> Callable[..., str]:
+        """Bind a language, returning a runner for repeated calls.
+
+        The language is resolved once, so the returned function goes
+        straight to the JavaScript or shell executor.
+
+        Example::
+
+            js = sandbox.with_language("javascript")
+            print(js("console.log('hello')"))
+
+        Args:
+            language: Either "javascript" or "shell".
+
+        Returns:
+            Function taking ``code`` (and optional ``stdin`` and
+            ``on_output``) that behaves like ``run(code, language)``.
+
+        Raises:
+            ValueError: If language is not "javascript" or "shell".
+        """
+        if language == "shell":
+            execute = self.shell
+        elif language == "javascript":
+            execute = self.execute
+        else:
+            raise ValueError(
+                f"Unknown language: '{language}' (expected 'javascript' or 'shell')"
+            )
+
+        def run(
+            code: str,
+            *,
+            stdin: str | bytes | None = None,
+            on_output: Callable[[str], None] | None = None,
+        ) -> str:
+            return execute(code, stdin=stdin, on_output=on_output).to_tool_message()
+
+        return run
+
     def as_langchain_tool(self) -> Any:
         """Convert to a LangChain-compatible tool.
 
@@ -497,6 +553,25 @@ Set language="shell" to run shell commands with:
                 limits.append(f"  - {name}: has parameter constraints")
         return "\n".join(limits)
 
+    def _get_batch_section(self) -> str:
+        """Describe the batch tool, if this sandbox exposes one."""
+        if not any(tool.name == BATCH_TOOL_NAME for tool in self.sandbox.tools):
+            return ""
+        return """
+**Independent calls can run concurrently with `batch`:**
+```javascript
+// One round trip instead of one per call; results come back in order
+const results = await batch([
+    {tool_name: "getData", args: {id: "item1"}},
+    {tool_name: "getInfo", args: {id: "item1"}},
+    {tool_name: "getData", args: {id: "item2"}},
+]);
+for (const r of results) {
+    if (r.status === "ok") console.log(JSON.stringify(r.value));
+    else console.log("failed:", r.error);
+}
+```"""
+
     def get_tool_descriptions(self) -> str:
         """Get formatted descriptions of available tools.
 
@@ -585,8 +660,13 @@ for (const item of items) {
     results.push({item, data, info});
 }
 console.log(JSON.stringify(results));
-```
+```""")
 
+        batch_section = self._get_batch_section()
+        if batch_section:
+            sections.append(batch_section)
+
+        sections.append("""
 Use the virtual filesystem to store intermediate data:
 ```javascript
 await fs.writeFile("/workspace/data.json", JSON.stringify(results));
@@ -674,8 +754,13 @@ for (const item of items) {
     results.push(data);
 }
 console.log(JSON.stringify(results));
-```
+```""")
+
+        batch_section = self._get_batch_section()
+        if batch_section:
+            sections.append(batch_section)
 
+        sections.append("""
 ### sandbox_shell - Shell Command Execution
 Use this for Unix-style data processing with pipes.
 Available utilities: grep, jq, tr, head, tail, sort, uniq, wc, cut, cat, echo, ls
@@ -7,18 +7,28 @@ It implements the stepping protocol and host operation routing.
 from __future__ import annotations
 
 import base64
+import hashlib
 import inspect
 import json
 import logging
+import sys
 import threading as _threading
 import time
-from collections.abc import Awaitable
+from collections import OrderedDict
+from collections.abc import Awaitable, Sequence
 from dataclasses import dataclass, field
+from datetime import UTC, datetime
 from enum import Enum
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Protocol, Union
 
-from ..capabilities import CallLimitExceededError, CapabilityError, MethodCapability
+from ..capabilities import (
+    CallLimitExceededError,
+    CapabilityError,
+    ConstraintError,
+    MethodCapability,
+    method_matches_pattern,
+)
 
 if TYPE_CHECKING:
     import wasmtime
@@ -31,14 +41,18 @@ _logger = logging.getLogger(__name__)
 class AuditCollectorProtocol(Protocol):
     """Protocol for audit collectors that can drain entries from the runtime.
 
-    This enables duck typing - any class with a drain_from_runtime method
-    can be used as an audit collector.
+    This enables duck typing - any class with drain_from_runtime and record
+    methods can be used as an audit collector.
     """
 
     def drain_from_runtime(self, runtime: "Runtime") -> list["AuditEntry"]:
         """Drain audit entries from the runtime."""
         ...
 
+    def record(self, raw: dict[str, Any]) -> AuditEntry:
+        """Record an event the host observed outside the runtime."""
+        ...
+
 
 class RuntimeError(Exception):
     """Error from the WASM runtime."""
@@ -143,6 +157,14 @@ TOOL_RESULT_CHUNK_SIZE = 2048
 # Maximum accumulated tool result size (10MB)
 MAX_TOOL_RESULT_SIZE = 10 * 1024 * 1024
 
+# Chunk size for read_stdin responses (4KB raw = ~5.5KB base64 + envelope)
+# Larger stdin is streamed across several reads so it fits OUTPUT_BUFFER_SIZE
+STDIN_CHUNK_SIZE = 4096
+
+# Compact JSON encoder for everything handed to the WASM runtime: no
+# whitespace after separators, so results take fewer bytes and chunks
+_encode_json = json.JSONEncoder(separators=(",", ":")).encode
+
 # Memory layout for host data (must not conflict with WASM stack/heap)
 # Using larger buffers to accommodate prelude + user code (can be ~3KB+)
 CMD_PTR = 1024  # Command string starts at 1KB
@@ -150,6 +172,11 @@ OUT_PTR = 8192  # Output buffer at 8KB (gives 7KB for commands)
 SUBMIT_PTR = 16384  # Submit buffer at 16KB
 AUDIT_PTR = 24576  # Audit drain buffer at 24KB
 
+# Upper bound on method names a runtime with wildcard capabilities remembers
+# matches for. Names come from sandboxed code, and a wildcard grant such as
+# "**" matches any of them, so the cache evicts least recently used names.
+METHOD_CACHE_SIZE = 256
+
 
 def _create_tool_result_responses(
     op_id: int,
@@ -175,7 +202,7 @@ def _create_tool_result_responses(
     """
     # Serialize the result to JSON bytes
     try:
-        result_bytes = json.dumps(result).encode("utf-8")
+        result_bytes = _encode_json(result).encode("utf-8")
     except (TypeError, ValueError) as e:
         # Result isn't JSON-serializable, return error
         return [
@@ -546,19 +573,19 @@ class Runtime:
             RuntimeError: If WASM runtime cannot be loaded.
         """
         self._config = config
-        self._capabilities = list(config.capabilities)
+        # Sets _capabilities and the call counters for max_calls enforcement
+        self.replace_capabilities(config.capabilities)
+
+        # Tool patterns and expiry granted by the PCA (read in _create_runtime).
+        # Checked for calls the host dispatches without going through WASM.
+        self._pca_tool_patterns: tuple[str, ...] | None = None
+        self._pca_expires_at: float | None = None
+
         self._tool_handler = config.tool_handler
         self._output_chunks: list[bytes] = []
         self._stderr_chunks: list[bytes] = []
         self._audit_collector: AuditCollectorProtocol | None = None
 
-        # Call counters for max_calls enforcement
-        # Maps capability key -> remaining calls (only for caps with max_calls)
-        self._call_counts: dict[str, int] = {}
-        for cap in self._capabilities:
-            if cap.max_calls is not None:
-                self._call_counts[cap.key()] = cap.max_calls
-
         # wasmtime objects (initialized in _load_wasm, always set before use)
         # Typed as optional since they start as None, but _load_wasm() is called
         # in __init__ so they're always set before any other method runs.
@@ -583,6 +610,27 @@ class Runtime:
         # Load WASM immediately - no lazy loading, fatal if fails
         self._load_wasm()
 
+    def _matching_capabilities(self, method: str) -> list[tuple[MethodCapability, str]]:
+        """Get (capability, key) pairs whose pattern matches a method (cached)."""
+        cache = self._method_caps
+        caps = cache.get(method)
+        if caps is not None:
+            if self._has_wildcards:
+                cache.move_to_end(method)
+            return caps
+        if not self._has_wildcards:
+            # The map is complete: an exact pattern only ever matches itself
+            return []
+        caps = [
+            (cap, sys.intern(cap.key()))
+            for cap in self._capabilities
+            if method_matches_pattern(method, cap.method_pattern)
+        ]
+        cache[method] = caps
+        if len(cache) > METHOD_CACHE_SIZE:
+            cache.popitem(last=False)
+        return caps
+
     @property
     def _store(self) -> wasmtime.Store:
         """Get the wasmtime Store (asserts initialized)."""
@@ -925,6 +973,39 @@ class Runtime:
                     "Ensure the PCA is signed by a trusted authority."
                 )
 
+        self._inspect_pca(memory)
+
+    def _inspect_pca(self, memory: Any) -> None:
+        """Read the tool patterns and expiry the PCA grants.
+
+        The WASM runtime enforces these for the tool calls it issues; the
+        host keeps a copy to enforce them for calls it dispatches itself.
+        Older WASM builds without ``pca_inspect`` leave the check disabled.
+
+        Args:
+            memory: WASM memory object.
+
+        Raises:
+            RuntimeError: If the PCA cannot be inspected.
+        """
+        inspect_fn = self._instance.exports(self._store).get("pca_inspect")
+        if inspect_fn is None:
+            return
+
+        pca_bytes = self._config.pca_bytes
+        pca_ptr = self._alloc_and_write(memory, pca_bytes)
+        n = inspect_fn(
+            self._store, pca_ptr, len(pca_bytes), OUT_PTR, OUTPUT_BUFFER_SIZE
+        )
+        if n <= 0 or n > OUTPUT_BUFFER_SIZE:
+            raise RuntimeError(f"Failed to inspect PCA: {self._get_last_error(memory)}")
+
+        info = json.loads(self._read_memory(memory, OUT_PTR, n))
+        self._pca_tool_patterns = tuple(info.get("capabilities", ()))
+        expires_at = info.get("expires_at")
+        if expires_at:
+            self._pca_expires_at = datetime.fromisoformat(expires_at).timestamp()
+
     def _set_trusted_authorities(self, memory: Any) -> None:
         """Set trusted authorities in WASM runtime.
 
@@ -1181,30 +1262,27 @@ class Runtime:
         # the generic "no capability authorizes" message
         constraint_violations: list[tuple[str, str]] = []  # (pattern, error_msg)
 
-        for cap in self._capabilities:
-            try:
-                cap.validate_call(method, params)
-                # Pattern and constraints match - check call limit
-                cap_key = cap.key()
-
-                if cap_key in self._call_counts:
-                    remaining = self._call_counts[cap_key]
-                    if remaining <= 0:
-                        # This capability is exhausted, try next
-                        exhausted_caps.append(cap)
-                        continue
-                    if consume:
-                        self._call_counts[cap_key] = remaining - 1
-
-                return cap  # Found a capability that allows this call
-            except CapabilityError as e:
-                # Check if pattern matched but constraints failed
-                error_msg = str(e)
-                if "does not match pattern" not in error_msg:
-                    # Pattern matched but constraints failed - record the violation
-                    constraint_violations.append((cap.method_pattern, error_msg))
+        for cap, cap_key in self._matching_capabilities(method):
+            if not cap.constraints.allows(params):
+                # Pattern matched but constraints failed - record the violation
+                try:
+                    cap.constraints.evaluate(params)
+                except ConstraintError as e:
+                    constraint_violations.append((cap.method_pattern, str(e)))
                 continue
 
+            # Pattern and constraints match - check call limit
+            if cap_key in self._call_counts:
+                remaining = self._call_counts[cap_key]
+                if remaining <= 0:
+                    # This capability is exhausted, try next
+                    exhausted_caps.append(cap)
+                    continue
+                if consume:
+                    self._call_counts[cap_key] = remaining - 1
+
+            return cap  # Found a capability that allows this call
+
         # Check if we had matching caps but they were all exhausted
         if exhausted_caps:
             # Report the first exhausted capability
@@ -1232,6 +1310,91 @@ class Runtime:
             f"Available patterns: {[c.method_pattern for c in self._capabilities]}"
         )
 
+    def _check_pca(self, method: str) -> None:
+        """Check a host-dispatched method against the PCA's grants and expiry.
+
+        PCA patterns may name tools with or without the ``mcp:`` prefix JS
+        tool calls carry, so both forms are tried.
+
+        Raises:
+            CapabilityError: If the PCA has expired or grants no such tool.
+        """
+        patterns = self._pca_tool_patterns
+        if patterns is None:
+            return
+        if self._pca_expires_at is not None and time.time() >= self._pca_expires_at:
+            raise CapabilityError("PCA has expired")
+        name = method.removeprefix("mcp:")
+        if not any(
+            method_matches_pattern(method, p) or method_matches_pattern(name, p)
+            for p in patterns
+        ):
+            raise CapabilityError(
+                f"PCA does not grant method '{method}'. "
+                f"Granted patterns: {list(patterns)}"
+            )
+
+    def _authorize_host_call(
+        self, method: str, params: dict[str, Any], *, via: str | None = None
+    ) -> MethodCapability:
+        """Enforce a tool call the host dispatches without going through WASM.
+
+        Such calls skip the runtime's own PCA check and audit log, so both
+        are done here: the method must be granted by the PCA as well as by a
+        capability (whose budget is charged), and the decision is recorded
+        as a ``tool_call`` entry with the audit collector, if one is set.
+
+        Args:
+            method: The method being called.
+            params: The call parameters.
+            via: The tool call this one was dispatched from, if any.
+
+        Returns:
+            The capability that authorized the call.
+
+        Raises:
+            CapabilityError: If the PCA or no capability authorizes this call.
+            CallLimitExceededError: If all matching capabilities are exhausted.
+        """
+        try:
+            self._check_pca(method)
+            cap = self._validate_tool_call(method, params)
+        except CapabilityError as e:
+            self._audit_host_call(method, params, via=via, error=str(e))
+            raise
+        self._audit_host_call(method, params, via=via)
+        return cap
+
+    def _audit_host_call(
+        self,
+        method: str,
+        params: dict[str, Any],
+        *,
+        via: str | None,
+        error: str | None = None,
+    ) -> None:
+        """Record a host-dispatched tool call with the audit collector."""
+        if self._audit_collector is None:
+            return
+        params_json = json.dumps(params, sort_keys=True, default=repr)
+        raw: dict[str, Any] = {
+            "type": "tool_call",
+            "session_id": f"rt-{self._runtime_id}",
+            "timestamp": datetime.now(UTC).isoformat(),
+            "runtime_id": self._runtime_id,
+            "tool": method,
+            "params_hash": hashlib.blake2b(
+                params_json.encode("utf-8"), digest_size=8
+            ).hexdigest(),
+            "dispatch": "host",
+            "allowed": error is None,
+        }
+        if via is not None:
+            raw["via"] = via
+        if error is not None:
+            raw["error"] = error
+        self._audit_collector.record(raw)
+
     def _error_response(
         self, op_id: int, runtime_id: int, code: str, message: str
     ) -> dict[str, Any]:
@@ -1289,14 +1452,16 @@ class Runtime:
                 return self._ok_response(
                     op_id, runtime_id, "stdin_data", data="", eof=True
                 )
-            remaining = self._stdin_data[self._stdin_pos :]
-            self._stdin_pos = len(self._stdin_data)
+            chunk = self._stdin_data[
+                self._stdin_pos : self._stdin_pos + STDIN_CHUNK_SIZE
+            ]
+            self._stdin_pos += len(chunk)
             return self._ok_response(
                 op_id,
                 runtime_id,
                 "stdin_data",
-                data=base64.b64encode(remaining).decode("ascii"),
-                eof=True,
+                data=base64.b64encode(chunk).decode("ascii"),
+                eof=self._stdin_pos >= len(self._stdin_data),
             )
 
         if op_type == "get_timestamp":
@@ -1488,7 +1653,7 @@ class Runtime:
 
             # Parse response
             response_bytes = self._read_memory(memory, OUT_PTR, n)
-            response = json.loads(response_bytes.decode("utf-8"))
+            response = json.loads(response_bytes)
 
             status = response.get("status", "running")
 
@@ -1559,7 +1724,7 @@ class Runtime:
             # Submit results, chunking if necessary to stay within buffer
             # For large tool results, submit one chunk at a time
             for result in all_results:
-                results_json = json.dumps([result]).encode("utf-8")
+                results_json = _encode_json([result]).encode("utf-8")
                 if len(results_json) > OUTPUT_BUFFER_SIZE:
                     raise RuntimeError(
                         f"Single result too large: {len(results_json)} bytes"
@@ -1687,7 +1852,7 @@ class Runtime:
 
             # Parse response
             response_bytes = self._read_memory(memory, OUT_PTR, n)
-            response = json.loads(response_bytes.decode("utf-8"))
+            response = json.loads(response_bytes)
 
             status = response.get("status", "running")
 
@@ -1758,7 +1923,7 @@ class Runtime:
             # Submit results, chunking if necessary to stay within buffer
             # For large tool results, submit one chunk at a time
             for result in all_results:
-                results_json = json.dumps([result]).encode("utf-8")
+                results_json = _encode_json([result]).encode("utf-8")
                 if len(results_json) > OUTPUT_BUFFER_SIZE:
                     raise RuntimeError(
                         f"Single result too large: {len(results_json)} bytes"
@@ -1869,6 +2034,165 @@ class Runtime:
         except (CapabilityError, CallLimitExceededError):
             return False
 
+    def can_call_batch(
+        self, method: str | Sequence[str], params_list: Sequence[dict[str, Any]]
+    ) -> list[bool]:
+        """Check whether each of several calls would be allowed.
+
+        Equivalent to calling ``can_call()`` once per entry: each entry is
+        checked against the current budgets and nothing is consumed. The
+        matching, non-exhausted capabilities are resolved once per distinct
+        method, and no error messages are built for rejected entries.
+
+        Args:
+            method: The method to check for every entry, or one method per
+                entry in params_list.
+            params_list: Parameters for each call.
+
+        Returns:
+            One bool per entry in params_list.
+
+        Raises:
+            ValueError: If a method sequence and params_list differ in length.
+        """
+        call_counts = self._call_counts
+
+        def allowed_by(m: str) -> list[Callable[[dict[str, Any]], bool]]:
+            return [
+                cap.constraints.allows
+                for cap, cap_key in self._matching_capabilities(m)
+                if call_counts.get(cap_key, 1) > 0
+            ]
+
+        if isinstance(method, str):
+            checks = allowed_by(method)
+            return [any(allows(params) for allows in checks) for params in params_list]
+
+        if len(method) != len(params_list):
+            raise ValueError(
+                f"Got {len(method)} methods for {len(params_list)} parameter sets"
+            )
+        checks_by_method: dict[str, list[Callable[[dict[str, Any]], bool]]] = {}
+        results: list[bool] = []
+        for m, params in zip(method, params_list):
+            checks = checks_by_method.get(m)
+            if checks is None:
+                checks = checks_by_method[m] = allowed_by(m)
+            results.append(any(allows(params) for allows in checks))
+        return results
+
+    def authorize_call(
+        self,
+        method: str,
+        params: dict[str, Any] | None = None,
+        *,
+        via: str | None = None,
+    ) -> MethodCapability:
+        """Check a method call and charge it against the budget, without calling it.
+
+        Use this when the host dispatches the call itself, e.g. several
+        tools fanned out from one batch request: each one is authorized
+        here, one at a time, and only then invoked. Such calls never reach
+        the WASM runtime, so the PCA is checked here and the decision is
+        recorded with the audit collector, like ``try_call()``.
+
+        Args:
+            method: The method to authorize.
+            params: Optional parameters (for constraint checking).
+            via: The tool call this one was dispatched from, if any;
+                recorded in the audit entry.
+
+        Returns:
+            The capability that authorized the call.
+
+        Raises:
+            CapabilityError: If the PCA or no capability authorizes this call.
+            CallLimitExceededError: If all matching capabilities are exhausted.
+        """
+        return self._authorize_host_call(
+            method, params if params is not None else {}, via=via
+        )
+
+    def try_call(self, method: str, params: dict[str, Any] | None = None) -> Any:
+        """Authorize a method call and invoke the tool handler from the host.
+
+        The call does not run through the WASM runtime. It is checked
+        against the PCA and the capabilities on the host instead, charged
+        against the budget of the capability that authorized it, and
+        recorded with the audit collector (allowed or denied) before the
+        handler runs. Unlike ``can_call()`` followed by a separate dispatch,
+        the capability set is only walked once.
+
+        Args:
+            method: The method to call.
+            params: Optional parameters (for constraint checking).
+
+        Returns:
+            The tool handler's result.
+
+        Raises:
+            CapabilityError: If the PCA or no capability authorizes this call.
+            CallLimitExceededError: If all matching capabilities are exhausted.
+            RuntimeError: If no tool handler is configured, or the handler
+                is async (use ``execute_async()`` for async handlers).
+        """
+        if params is None:
+            params = {}
+
+        self._authorize_host_call(method, params)
+
+        if self._tool_handler is None:
+            raise RuntimeError("No tool handler configured")
+
+        result = self._tool_handler(method, params)
+        if inspect.iscoroutine(result):
+            result.close()
+            raise RuntimeError(
+                f"Tool handler returned a coroutine for '{method}'. "
+                "Use execute_async() for async handlers."
+            )
+        return result
+
+    def replace_capabilities(self, capabilities: Sequence[MethodCapability]) -> None:
+        """Replace the enforced capabilities and start their budgets afresh.
+
+        The WASM instance, its VFS and the PCA are kept; only the host-side
+        capability checks change. Every capability with max_calls gets its
+        full budget back, including ones that were already in use.
+
+        Args:
+            capabilities: The capabilities to enforce from now on.
+        """
+        self._capabilities = list(capabilities)
+
+        # Maps method name -> (capability, key) for each capability whose
+        # pattern matches it, in declaration order. Pattern matching doesn't
+        # depend on params, so each method only pays for the pattern scan and
+        # key formatting once. Without wildcard patterns the map is built up
+        # front and stays as large as the capability list; with them it is
+        # filled lazily and bounded by METHOD_CACHE_SIZE.
+        self._has_wildcards = any(
+            "*" in cap.method_pattern for cap in self._capabilities
+        )
+        self._method_caps: OrderedDict[str, list[tuple[MethodCapability, str]]] = (
+            OrderedDict()
+        )
+        if not self._has_wildcards:
+            for cap in self._capabilities:
+                self._method_caps.setdefault(cap.method_pattern, []).append(
+                    (cap, sys.intern(cap.key()))
+                )
+
+        # Call counters for max_calls enforcement
+        # Maps capability key -> remaining calls (only for caps with max_calls)
+        # Keys are interned like the ones cached by _matching_capabilities(),
+        # so budget lookups on the call path compare by identity
+        self._call_counts: dict[str, int] = {
+            sys.intern(cap.key()): cap.max_calls
+            for cap in self._capabilities
+            if cap.max_calls is not None
+        }
+
     def get_capabilities(self) -> list[MethodCapability]:
         """Get all capabilities for this runtime.
 
@@ -58,6 +58,7 @@ Architecture::
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -160,6 +161,9 @@ class Sandbox:
     _runtime: Runtime | None = field(default=None, repr=False)
     _prelude: str | None = field(default=None, repr=False)
     _audit_collector: AuditCollector | None = field(default=None, repr=False)
+    _cleanups: list[Callable[[], None]] = field(
+        default_factory=lambda: list[Callable[[], None]](), repr=False
+    )
 
     def __post_init__(self) -> None:
         """Initialize the sandbox."""
@@ -258,6 +262,8 @@ class Sandbox:
         code: str,
         on_output: Callable[[str], None] | None = None,
         stdin: str | bytes | None = None,
+        *,
+        capture_stdout: bool = True,
     ) -> str:
         """Execute JavaScript code in the sandbox.
 
@@ -303,9 +309,12 @@ class Sandbox:
                 chunk of stdout as it becomes available.
             stdin: Optional JavaScript code to provide via stdin. Useful for
                 bypassing command size limits with large code blocks.
+            capture_stdout: If False, console.log output is discarded inside
+                the sandbox, for scripts run only for their side effects.
 
         Returns:
-            stdout output from the code execution.
+            stdout output from the code execution (empty if capture_stdout
+            is False).
 
         Raises:
             RuntimeError: If execution fails or sandbox not initialized.
@@ -313,45 +322,16 @@ class Sandbox:
         if self._runtime is None:
             raise RuntimeError("Sandbox not initialized")
 
-        # Get cached prelude (reads from VFS once on first call)
-        prelude = self._get_prelude()
-
         # If stdin provided, use it for the code (bypasses command size limits)
         if stdin is not None:
             stdin_code = stdin if isinstance(stdin, str) else stdin.decode("utf-8")
-            # Wrap in async IIFE with .then() to capture return value and .catch() for errors
-            wrapped_code = (
-                f"(async () => {{\n{stdin_code}\n}})()"
-                f".then(r => {{ if (r !== undefined) console.log(typeof r === 'string' ? r : JSON.stringify(r)); }})"
-                f".catch(e => {{"
-                f"  const msg = (e.name ? e.name + ': ' : '') + (e.message || String(e));"
-                f"  console.error(e.stack ? msg + '\\n' + e.stack : msg);"
-                f"}});"
-            )
-            full_code = f"{prelude}\n{wrapped_code}" if prelude else wrapped_code
+            full_code = self._build_script(stdin_code, capture_stdout)
             # Use `node -` to read from stdin
             return self._runtime.execute("node -", on_output, stdin=full_code)
 
-        # Wrap user code in async IIFE to support top-level await
-        # QuickJS script mode doesn't support top-level await natively
-        # The .then() handler captures the return value and logs it (if not undefined)
-        # The .catch() handler ensures unhandled rejections are reported to stderr
-        # Without it, errors like `x.foo.bar` where x is undefined silently fail
-        # We format the error with name: message\\nstack for readable output
-        wrapped_code = (
-            f"(async () => {{\n{code}\n}})()"
-            f".then(r => {{ if (r !== undefined) console.log(typeof r === 'string' ? r : JSON.stringify(r)); }})"
-            f".catch(e => {{"
-            f"  const msg = (e.name ? e.name + ': ' : '') + (e.message || String(e));"
-            f"  console.error(e.stack ? msg + '\\n' + e.stack : msg);"
-            f"}});"
-        )
-
-        # Combine prelude with wrapped user code
-        full_code = f"{prelude}\n{wrapped_code}" if prelude else wrapped_code
-
         # Wrap code in node command
         # The shell's "node -e" applet executes JavaScript
+        full_code = self._build_script(code, capture_stdout)
         return self._runtime.execute(f"node -e {_quote_js(full_code)}", on_output)
 
     async def execute_async(
@@ -359,6 +339,8 @@ class Sandbox:
         code: str,
         on_output: Callable[[str], None] | None = None,
         stdin: str | bytes | None = None,
+        *,
+        capture_stdout: bool = True,
     ) -> str:
         """Execute JavaScript code with async tool handler support.
 
@@ -390,9 +372,12 @@ class Sandbox:
                 chunk of stdout as it becomes available.
             stdin: Optional JavaScript code to provide via stdin. Useful for
                 bypassing command size limits with large code blocks.
+            capture_stdout: If False, console.log output is discarded inside
+                the sandbox, for scripts run only for their side effects.
 
         Returns:
-            stdout output from the code execution.
+            stdout output from the code execution (empty if capture_stdout
+            is False).
 
         Raises:
             RuntimeError: If execution fails or sandbox not initialized.
@@ -400,28 +385,40 @@ class Sandbox:
         if self._runtime is None:
             raise RuntimeError("Sandbox not initialized")
 
-        # Get cached prelude (reads from VFS once on first call)
-        prelude = self._get_prelude()
-
         # If stdin provided, use it for the code (bypasses command size limits)
         if stdin is not None:
             stdin_code = stdin if isinstance(stdin, str) else stdin.decode("utf-8")
-            wrapped_code = (
-                f"(async () => {{\n{stdin_code}\n}})()"
-                f".then(r => {{ if (r !== undefined) console.log(typeof r === 'string' ? r : JSON.stringify(r)); }})"
-                f".catch(e => {{"
-                f"  const msg = (e.name ? e.name + ': ' : '') + (e.message || String(e));"
-                f"  console.error(e.stack ? msg + '\\n' + e.stack : msg);"
-                f"}});"
-            )
-            full_code = f"{prelude}\n{wrapped_code}" if prelude else wrapped_code
+            full_code = self._build_script(stdin_code, capture_stdout)
             return await self._runtime.execute_async(
                 "node -", on_output, stdin=full_code
             )
 
+        # Use async execute to await async tool handlers
+        full_code = self._build_script(code, capture_stdout)
+        return await self._runtime.execute_async(
+            f"node -e {_quote_js(full_code)}", on_output
+        )
+
+    def _build_script(self, code: str, capture_stdout: bool) -> str:
+        """Wrap user code with the prelude into a script for the node applet.
+
+        Args:
+            code: User JavaScript code.
+            capture_stdout: If False, console.log (and the return value
+                echo) are silenced inside the sandbox.
+
+        Returns:
+            The full script to run.
+        """
+        # Get cached prelude (reads from VFS once on first call)
+        prelude = self._get_prelude()
+
         # Wrap user code in async IIFE to support top-level await
+        # QuickJS script mode doesn't support top-level await natively
         # The .then() handler captures the return value and logs it (if not undefined)
         # The .catch() handler ensures unhandled rejections are reported to stderr
+        # Without it, errors like `x.foo.bar` where x is undefined silently fail
+        # We format the error with name: message\\nstack for readable output
         wrapped_code = (
             f"(async () => {{\n{code}\n}})()"
             f".then(r => {{ if (r !== undefined) console.log(typeof r === 'string' ? r : JSON.stringify(r)); }})"
@@ -430,16 +427,21 @@ class Sandbox:
             f"  console.error(e.stack ? msg + '\\n' + e.stack : msg);"
             f"}});"
         )
+        if not capture_stdout:
+            # Drop output before it is written, so nothing crosses the
+            # WASM boundary; stderr still reports errors
+            wrapped_code = f"console.log = () => {{}};\n{wrapped_code}"
 
         # Combine prelude with wrapped user code
-        full_code = f"{prelude}\n{wrapped_code}" if prelude else wrapped_code
-
-        # Use async execute to await async tool handlers
-        return await self._runtime.execute_async(
-            f"node -e {_quote_js(full_code)}", on_output
-        )
+        return f"{prelude}\n{wrapped_code}" if prelude else wrapped_code
 
-    def shell(self, command: str, stdin: str | bytes | None = None) -> str:
+    def shell(
+        self,
+        command: str,
+        stdin: str | bytes | None = None,
+        *,
+        on_output: Callable[[str], None] | None = None,
+    ) -> str:
         """Execute a shell command in the sandbox.
 
         Provides Unix-like utilities:
@@ -468,13 +470,15 @@ class Sandbox:
             command: Shell command to execute.
             stdin: Optional data to provide on stdin. Useful for piping
                 large scripts to `sh` without hitting command size limits.
+            on_output: Optional callback for streaming output, as in
+                ``execute()``.
 
         Returns:
             Command output.
         """
         if self._runtime is None:
             raise RuntimeError("Sandbox not initialized")
-        return self._runtime.execute(command, stdin=stdin)
+        return self._runtime.execute(command, on_output, stdin=stdin)
 
     def can_call(self, method: str, params: dict[str, Any] | None = None) -> bool:
         """Check if a tool call would be allowed.
@@ -493,6 +497,139 @@ class Sandbox:
             return False
         return self._runtime.can_call(method, params)
 
+    def can_call_batch(
+        self, method: str | Sequence[str], params_list: Sequence[dict[str, Any]]
+    ) -> list[bool]:
+        """Check whether each of several calls would be allowed.
+
+        Same answers as calling ``can_call()`` once per entry, but each
+        distinct method's capabilities are resolved once for the whole
+        batch. Nothing is consumed, so every entry is judged against the
+        current budgets.
+
+        Example::
+
+            amounts = [500, 1500, 100]
+            allowed = sandbox.can_call_batch(
+                "transfer", [{"amount": a} for a in amounts]
+            )  # [True, False, True] with an amount <= 1000 constraint
+
+            # Or one method per entry
+            sandbox.can_call_batch(
+                ["balance", "transfer"], [{"account_id": "A"}, {"amount": 5000}]
+            )  # [True, False]
+
+        Args:
+            method: The method to check for every entry, or one method per
+                entry in params_list.
+            params_list: Parameters for each call.
+
+        Returns:
+            One bool per entry in params_list; all False if the sandbox
+            is not initialized.
+
+        Raises:
+            ValueError: If a method sequence and params_list differ in length.
+        """
+        if self._runtime is None:
+            return [False] * len(params_list)
+        return self._runtime.can_call_batch(method, params_list)
+
+    def authorize_call(
+        self,
+        method: str,
+        params: dict[str, Any] | None = None,
+        *,
+        via: str | None = None,
+    ) -> MethodCapability:
+        """Authorize a tool call and charge its budget without invoking it.
+
+        For hosts that dispatch calls themselves (see the ``batch`` tool of
+        ``create_sandbox_tool``). Unlike ``can_call()``, an allowed call
+        consumes one call from the matching capability's budget. As with
+        ``try_call()``, the PCA must grant the method and the decision is
+        recorded as a ``tool_call`` audit entry.
+
+        Args:
+            method: The method to authorize, e.g. ``"mcp:get_weather"``.
+            params: Optional parameters for the call.
+            via: The tool call this one was dispatched from, e.g.
+                ``"mcp:batch"``; recorded in the audit entry.
+
+        Returns:
+            The capability that authorized the call.
+
+        Raises:
+            CapabilityError: If the PCA or no capability allows this call.
+            CallLimitExceededError: If the matching capability budgets are exhausted.
+            RuntimeError: If sandbox not initialized.
+        """
+        if self._runtime is None:
+            raise RuntimeError("Sandbox not initialized")
+        return self._runtime.authorize_call(method, params, via=via)
+
+    def try_call(self, method: str, params: dict[str, Any] | None = None) -> Any:
+        """Call a tool directly from Python, enforcing capabilities.
+
+        Combines the ``can_call()`` check and the call itself: capabilities
+        are matched once, the matching capability's budget is charged, and
+        the tool handler is invoked without going through JavaScript.
+
+        Because the call bypasses the WASM runtime, the host enforces what
+        the runtime would: the PCA must grant the method, and the call is
+        recorded as a ``tool_call`` audit entry (``dispatch: "host"``)
+        whether it is allowed or denied.
+
+        Example::
+
+            try:
+                result = sandbox.try_call("transfer", {"amount": 100, "to": "bob"})
+            except CallLimitExceededError:
+                print("Budget exhausted")
+            except CapabilityError as e:
+                print(f"Denied: {e}")
+
+        Args:
+            method: The method to call.
+            params: Optional parameters for the call.
+
+        Returns:
+            The tool handler's result.
+
+        Raises:
+            CapabilityError: If the PCA or no capability allows this call.
+            CallLimitExceededError: If the matching capability budgets are exhausted.
+            RuntimeError: If sandbox not initialized or no tool handler is set.
+        """
+        if self._runtime is None:
+            raise RuntimeError("Sandbox not initialized")
+        return self._runtime.try_call(method, params)
+
+    def replace_capabilities(self, capabilities: Sequence[MethodCapability]) -> None:
+        """Swap this sandbox's capabilities without rebuilding its runtime.
+
+        Cheaper than creating a new Sandbox when one agent hands over to
+        another with different permissions. Budgets start over from each
+        new capability's max_calls; the VFS and the PCA are unchanged.
+
+        Example::
+
+            sandbox.replace_capabilities(
+                [MethodCapability(method_pattern="mcp:payout", max_calls=1)]
+            )
+            sandbox.get_remaining_calls("cap:method:mcp:payout")  # 1
+
+        Args:
+            capabilities: The capabilities to enforce from now on.
+
+        Raises:
+            RuntimeError: If sandbox not initialized.
+        """
+        if self._runtime is None:
+            raise RuntimeError("Sandbox not initialized")
+        self.capabilities = list(capabilities)
+        self._runtime.replace_capabilities(self.capabilities)
+
     @property
     def last_stderr(self) -> str:
         """Get stderr from the last execution.
@@ -603,6 +740,36 @@ class Sandbox:
         """
         return self._audit_collector
 
+    def add_cleanup(self, callback: Callable[[], None]) -> None:
+        """Register a callback to run when the sandbox is closed.
+
+        Used for resources that live as long as the sandbox, such as the
+        worker pool of a ``batch`` tool. Callbacks run in reverse order of
+        registration.
+
+        Args:
+            callback: Called with no arguments by ``close()``.
+        """
+        self._cleanups.append(callback)
+
+    def close(self) -> None:
+        """Release the sandbox's resources.
+
+        Runs the registered cleanup callbacks, closes the audit collector
+        (flushing its file, if configured) and destroys the runtime. Called
+        automatically when leaving a ``with`` block.
+        """
+        while self._cleanups:
+            self._cleanups.pop()()
+
+        # Clean up audit collector (flushes file if configured)
+        if self._audit_collector is not None:
+            self._audit_collector.close()
+            self._audit_collector = None
+
+        # Clean up runtime resources
+        self._runtime = None
+
     def __enter__(self) -> Sandbox:
         """Enter context manager.
 
@@ -632,13 +799,7 @@ class Sandbox:
             exc_val: Exception value if an exception was raised, None otherwise.
             exc_tb: Traceback if an exception was raised, None otherwise.
         """
-        # Clean up audit collector (flushes file if configured)
-        if self._audit_collector is not None:
-            self._audit_collector.close()
-            self._audit_collector = None
-
-        # Clean up runtime resources
-        self._runtime = None
+        self.close()
 
 
 def _quote_js(code: str) -> str:
@@ -6,7 +6,16 @@ route calls from the sandbox to Python functions.
 
 from __future__ import annotations
 
-from typing import Any, Callable, Sequence
+import asyncio
+import inspect
+import os
+import threading
+from collections.abc import Awaitable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Sequence, cast
+
+from ..capabilities import CapabilityError
+from .definition import ToolDefinition
 
 
 def create_tool_handler(
@@ -36,10 +45,302 @@ def create_tool_handler(
 
     def handler(method: str, params: dict[str, Any]) -> Any:
         # Strip mcp: prefix if present (WASM runtime adds it)
-        name = method.removeprefix("mcp:")
-        if name not in tool_map:
+        func = tool_map.get(method.removeprefix("mcp:"))
+        if func is None:
             raise ValueError(f"Unknown tool: {method}")
-        func = tool_map[name]
         return func(**params)
 
     return handler
+
+
+BATCH_TOOL_NAME = "batch"
+"""Name of the meta-tool that fans out several tool calls at once."""
+
+DEFAULT_TOOL_CONCURRENCY_LIMIT = 8
+"""Batch worker threads when TOOL_CONCURRENCY_LIMIT is not set."""
+
+
+def tool_concurrency_limit() -> int:
+    """Get how many batch invocations may run at once.
+
+    Read from the ``TOOL_CONCURRENCY_LIMIT`` environment variable, falling
+    back to :data:`DEFAULT_TOOL_CONCURRENCY_LIMIT`. A limit of 1 runs
+    batches one invocation at a time on the calling thread.
+
+    Raises:
+        ValueError: If the variable is set but is not a positive integer.
+    """
+    value = os.environ.get("TOOL_CONCURRENCY_LIMIT")
+    if value is None or not value.strip():
+        return DEFAULT_TOOL_CONCURRENCY_LIMIT
+    try:
+        limit = int(value)
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        raise ValueError(
+            f"TOOL_CONCURRENCY_LIMIT must be a positive integer, got {value!r}"
+        )
+    return limit
+
+
+def batch_tool_definition() -> ToolDefinition:
+    """Describe the ``batch`` meta-tool for the sandbox.
+
+    Returns:
+        ToolDefinition taking a list of ``{tool_name, args}`` invocations.
+    """
+    return ToolDefinition(
+        name=BATCH_TOOL_NAME,
+        description=(
+            "Run several tool calls concurrently. Takes a list of "
+            "{tool_name, args} invocations and returns one "
+            "{status, value | error} result per invocation, in order."
+        ),
+        parameters={
+            "type": "object",
+            "properties": {
+                "invocations": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "tool_name": {"type": "string"},
+                            "args": {"type": "object"},
+                        },
+                        "required": ["tool_name"],
+                    },
+                },
+            },
+            "required": ["invocations"],
+        },
+    )
+
+
+class BatchHandler:
+    """Handler behind the ``batch`` meta-tool; see :func:`create_batch_handler`.
+
+    Owns a worker pool for sync tools and an event loop thread for async
+    ones. Both are started on first use and reused by later batches until
+    :meth:`close` shuts them down. Every coroutine runs on that one loop,
+    so async tools can share loop-bound resources such as an HTTP client
+    session.
+    """
+
+    def __init__(
+        self,
+        tool_map: Mapping[str, Callable[..., Any]],
+        authorize: Callable[[str, dict[str, Any]], Any],
+        *,
+        max_workers: int | None = None,
+    ) -> None:
+        self._tool_map = tool_map
+        self._authorize = authorize
+        self._workers = (
+            max_workers if max_workers is not None else tool_concurrency_limit()
+        )
+        self._pool: ThreadPoolExecutor | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: threading.Thread | None = None
+        self._loop_lock = threading.Lock()
+
+    def __call__(self, params: Any) -> list[dict[str, Any]]:
+        """Run one batch request.
+
+        Args:
+            params: A list of ``{tool_name, args}`` invocations, or
+                ``{"invocations": [...]}``.
+
+        Returns:
+            One ``{status, value | error}`` result per invocation, in order.
+
+        Raises:
+            TypeError: If params holds no list of invocations.
+        """
+        invocations = params.get("invocations") if isinstance(params, dict) else params
+        if not isinstance(invocations, list):
+            raise TypeError("batch expects a list of {tool_name, args} invocations")
+
+        results: list[dict[str, Any]] = []
+        approved: list[tuple[int, Callable[..., Any], dict[str, Any]]] = []
+        for invocation in cast(list[Any], invocations):
+            try:
+                func, args = _authorize_invocation(
+                    invocation, self._tool_map, self._authorize
+                )
+            except (CapabilityError, TypeError, ValueError) as e:
+                results.append({"status": "error", "error": str(e)})
+                continue
+            approved.append((len(results), func, args))
+            results.append({})
+
+        async_calls = [c for c in approved if inspect.iscoroutinefunction(c[1])]
+        sync_calls = [c for c in approved if not inspect.iscoroutinefunction(c[1])]
+
+        # Start the async invocations first so they overlap the sync ones
+        gathered = (
+            asyncio.run_coroutine_threadsafe(
+                self._gather([(func, args) for _, func, args in async_calls]),
+                self._event_loop(),
+            )
+            if async_calls
+            else None
+        )
+
+        if len(sync_calls) == 1 or self._workers == 1:
+            for index, func, args in sync_calls:
+                results[index] = self._run_sync(func, args)
+        elif sync_calls:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self._workers, thread_name_prefix="amla-batch"
+                )
+            futures = [
+                (index, self._pool.submit(self._run_sync, func, args))
+                for index, func, args in sync_calls
+            ]
+            for index, future in futures:
+                results[index] = future.result()
+
+        if gathered is not None:
+            for (index, _, _), result in zip(async_calls, gathered.result()):
+                results[index] = result
+        return results
+
+    def close(self) -> None:
+        """Shut down the worker pool and event loop thread.
+
+        Waits for running invocations. The handler stays usable; a later
+        batch starts a new pool or loop when it needs one.
+        """
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+            thread, self._loop_thread = self._loop_thread, None
+        if loop is not None and thread is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the loop async tools run on, starting its thread if needed."""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="amla-batch-loop", daemon=True
+                )
+                thread.start()
+                self._loop, self._loop_thread = loop, thread
+            return self._loop
+
+    async def _gather(
+        self, calls: list[tuple[Callable[..., Any], dict[str, Any]]]
+    ) -> list[dict[str, Any]]:
+        """Await a batch's async invocations together, at most N at a time."""
+        limit = asyncio.Semaphore(self._workers)
+
+        async def run(func: Callable[..., Any], args: dict[str, Any]) -> Any:
+            async with limit:
+                return await func(**args)
+
+        outcomes = await asyncio.gather(
+            *(run(func, args) for func, args in calls), return_exceptions=True
+        )
+        return [_result(outcome) for outcome in outcomes]
+
+    def _run_sync(
+        self, func: Callable[..., Any], args: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Call one approved sync tool, folding any exception into an error result."""
+        try:
+            value = func(**args)
+            if inspect.isawaitable(value):
+                # A plain function that hands back a coroutine (a wrapped
+                # async tool): finish it on the shared loop
+                value = asyncio.run_coroutine_threadsafe(
+                    _awaited(cast(Awaitable[Any], value)), self._event_loop()
+                ).result()
+        except Exception as e:  # noqa: BLE001 - one failing tool must not sink the batch
+            return {"status": "error", "error": str(e)}
+        return {"status": "ok", "value": value}
+
+
+def create_batch_handler(
+    tool_map: Mapping[str, Callable[..., Any]],
+    authorize: Callable[[str, dict[str, Any]], Any],
+    *,
+    max_workers: int | None = None,
+) -> BatchHandler:
+    """Create the handler behind the ``batch`` meta-tool.
+
+    The sandbox hands tool calls to the host one at a time, so a script
+    that awaits N tools pays N round trips back to back. A batch call
+    instead runs its invocations in a thread pool, which turns the wall
+    clock for I/O-bound tools from the sum of their latencies into
+    roughly the slowest one. The pool is started on the first batch and
+    reused by later ones; call ``close()`` on the handler (or close the
+    sandbox it was registered with) to shut it down.
+
+    Every invocation is still checked: ``authorize`` is called for each
+    one, in order and before anything runs, so capability constraints and
+    call budgets apply exactly as if the tool had been awaited directly.
+    Rejected or failing invocations don't abort the batch; they show up as
+    ``{"status": "error", "error": ...}`` entries.
+
+    Tools may be ``async def``. A batch's async invocations are awaited
+    together with ``asyncio.gather`` on one event loop, owned by the
+    handler and shared by every batch, with at most ``max_workers`` in
+    flight. Sync tools keep running on the thread pool.
+
+    Args:
+        tool_map: Tool name to Python function (sync or async).
+        authorize: Called with ``("mcp:<tool_name>", args)``; charges the
+            call's budget and raises CapabilityError if it isn't allowed.
+        max_workers: Maximum invocations running at once. Defaults to
+            :func:`tool_concurrency_limit`.
+
+    Returns:
+        Handler taking either a list of invocations or
+        ``{"invocations": [...]}`` and returning one result per invocation.
+    """
+    return BatchHandler(tool_map, authorize, max_workers=max_workers)
+
+
+def _authorize_invocation(
+    invocation: Any,
+    tool_map: Mapping[str, Callable[..., Any]],
+    authorize: Callable[[str, dict[str, Any]], Any],
+) -> tuple[Callable[..., Any], dict[str, Any]]:
+    """Resolve one batch invocation and charge it against the capabilities."""
+    if not isinstance(invocation, dict):
+        raise TypeError("Invocation must be an object with tool_name and args")
+    invocation = cast(dict[str, Any], invocation)
+    name = invocation.get("tool_name")
+    args = invocation.get("args") or {}
+    if not isinstance(name, str) or name == BATCH_TOOL_NAME:
+        raise ValueError(f"Invalid tool_name: {name!r}")
+    func = tool_map.get(name)
+    if func is None:
+        raise ValueError(f"Unknown tool: '{name}'")
+    if not isinstance(args, dict):
+        raise TypeError(f"args for '{name}' must be an object")
+    args = cast(dict[str, Any], args)
+    authorize(f"mcp:{name}", args)
+    return func, args
+
+
+def _result(outcome: Any) -> dict[str, Any]:
+    """Turn a gathered outcome into a ``{status, value | error}`` result."""
+    if isinstance(outcome, Exception):
+        return {"status": "error", "error": str(outcome)}
+    if isinstance(outcome, BaseException):
+        raise outcome
+    return {"status": "ok", "value": outcome}
+
+
+async def _awaited(awaitable: Awaitable[Any]) -> Any:
+    """Wrap any awaitable in a coroutine for run_coroutine_threadsafe()."""
+    return await awaitable
@@ -2,9 +2,33 @@
 
 # pyright: reportPrivateUsage=warning
 
-from amla_sandbox import create_sandbox_tool
-from amla_sandbox.bash_tool import _parse_constraints, _parse_string_constraint
+import asyncio
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from amla_sandbox import (
+    MethodCapability,
+    Sandbox,
+    create_sandbox_tool,
+    tool_from_function,
+)
+from amla_sandbox.audit import AuditConfig
+from amla_sandbox.auth import EphemeralAuthority
+from amla_sandbox.bash_tool import (
+    _memoize,
+    _parse_constraints,
+    _parse_string_constraint,
+)
 from amla_sandbox.capabilities import Constraint
+from amla_sandbox.tools.handlers import (
+    BatchHandler,
+    batch_tool_definition,
+    create_batch_handler,
+    tool_concurrency_limit,
+)
 
 
 # === Sample tools for testing ===
@@ -92,6 +116,270 @@ class TestCreateSandboxTool:
         assert caps[0].max_calls == 100
 
 
+# === Tests for the batch tool ===
+
+
+class TestBatchTool:
+    """Tests for create_sandbox_tool(batch=True)."""
+
+    def test_not_exposed_by_default(self) -> None:
+        """Without batch=True there is no batch tool or capability."""
+        sandbox = create_sandbox_tool(tools=[add])
+
+        assert [t.name for t in sandbox.sandbox.tools] == ["add"]
+        assert "batch" not in sandbox.get_system_prompt()
+
+    def test_results_in_order(self) -> None:
+        """Each invocation yields a status/value entry in request order."""
+        sandbox = create_sandbox_tool(tools=[add, greet], batch=True)
+
+        result = sandbox.run(
+            """
+            const results = await batch([
+                {tool_name: "add", args: {a: 1, b: 2}},
+                {tool_name: "greet", args: {name: "Ada"}},
+                {tool_name: "add", args: {a: 10, b: 5}},
+            ]);
+            console.log(JSON.stringify(results));
+        """,
+            language="javascript",
+        )
+
+        assert result.strip() == (
+            '[{"status":"ok","value":3},'
+            '{"status":"ok","value":"Hello, Ada!"},'
+            '{"status":"ok","value":15}]'
+        )
+        assert "await batch([" in sandbox.get_system_prompt()
+
+    def test_inner_calls_are_checked_and_counted(self) -> None:
+        """Inner calls obey constraints and budgets; failures don't abort the batch."""
+        sandbox = create_sandbox_tool(
+            tools=[add, transfer_money],
+            constraints={"transfer_money": {"amount": "<=1000"}},
+            max_calls={"add": 1},
+            batch=True,
+        )
+
+        result = sandbox.run(
+            """
+            const results = await batch({invocations: [
+                {tool_name: "add", args: {a: 1, b: 1}},
+                {tool_name: "add", args: {a: 2, b: 2}},
+                {tool_name: "transfer_money", args: {amount: 5000, to_account: "x"}},
+                {tool_name: "nope", args: {}},
+                {tool_name: "transfer_money", args: {amount: 10, to_account: "x"}},
+            ]});
+            console.log(JSON.stringify(results.map((r) => r.status)));
+        """,
+            language="javascript",
+        )
+
+        assert result.strip() == '["ok","error","error","error","ok"]'
+        counts = sandbox.sandbox.get_call_counts()
+        assert counts["cap:method:mcp:add"] == 0
+        assert counts["cap:method:mcp:transfer_money"] == 99
+
+    def test_inner_calls_are_audited_and_pca_checked(self) -> None:
+        """Every inner call gets its own audit entry and PCA check."""
+        authority = EphemeralAuthority()
+        pca = authority.create_pca(capabilities=["tool_call:add", "tool_call:batch"])
+        batch: list[BatchHandler] = []
+
+        def handle_tool(method: str, params: Any) -> Any:
+            if method == "batch":
+                return batch[0](params)
+            return add(**params)
+
+        sandbox = Sandbox(
+            pca=pca.to_cbor(),
+            trusted_authorities=[authority.public_key_hex()],
+            tools=[tool_from_function(add), batch_tool_definition()],
+            capabilities=[MethodCapability(method_pattern="**")],
+            tool_handler=handle_tool,
+            audit_config=AuditConfig(agent_id="agent-1"),
+        )
+        batch.append(
+            create_batch_handler(
+                {"add": add, "greet": greet},
+                lambda method, params: sandbox.authorize_call(
+                    method, params, via="mcp:batch"
+                ),
+            )
+        )
+
+        result = sandbox.execute(
+            """
+            const results = await batch([
+                {tool_name: "add", args: {a: 1, b: 2}},
+                {tool_name: "greet", args: {name: "Ada"}},
+                {tool_name: "add", args: {a: 3, b: 4}},
+            ]);
+            console.log(JSON.stringify(results.map((r) => r.status)));
+        """
+        )
+
+        assert result.strip() == '["ok","error","ok"]'
+        entries = [
+            e.data
+            for e in sandbox.get_audit_entries(entry_type="tool_call")
+            if e.data.get("via") == "mcp:batch"
+        ]
+        assert [(e["tool"], e["allowed"]) for e in entries] == [
+            ("mcp:add", True),
+            ("mcp:greet", False),
+            ("mcp:add", True),
+        ]
+        assert "PCA does not grant" in entries[1]["error"]
+
+    def test_close_shuts_down_worker_pool(self) -> None:
+        """Closing the sandbox stops the batch worker threads."""
+
+        def batch_threads() -> set[threading.Thread]:
+            return {t for t in threading.enumerate() if t.name.startswith("amla-batch")}
+
+        before = batch_threads()
+        sandbox = create_sandbox_tool(tools=[add], batch=True)
+        sandbox.run(
+            "await batch([{tool_name: 'add', args: {a: 1, b: 2}},"
+            " {tool_name: 'add', args: {a: 3, b: 4}}]);",
+            language="javascript",
+        )
+        workers = batch_threads() - before
+        assert workers
+
+        sandbox.sandbox.close()
+        assert not any(t.is_alive() for t in workers)
+
+    def test_concurrency_limit_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """TOOL_CONCURRENCY_LIMIT caps how many batch invocations overlap."""
+        monkeypatch.delenv("TOOL_CONCURRENCY_LIMIT", raising=False)
+        assert tool_concurrency_limit() == 8
+
+        monkeypatch.setenv("TOOL_CONCURRENCY_LIMIT", "0")
+        with pytest.raises(ValueError, match="TOOL_CONCURRENCY_LIMIT"):
+            tool_concurrency_limit()
+
+        monkeypatch.setenv("TOOL_CONCURRENCY_LIMIT", "1")
+        threads: set[str] = set()
+
+        def whoami() -> str:
+            threads.add(threading.current_thread().name)
+            return "ok"
+
+        handler = create_batch_handler({"whoami": whoami}, lambda m, p: None)
+        results = handler([{"tool_name": "whoami"}] * 3)
+
+        assert [r["status"] for r in results] == ["ok"] * 3
+        assert threads == {threading.current_thread().name}
+
+    def test_async_tools_overlap(self) -> None:
+        """Async tools can be batched and run concurrently."""
+
+        async def slow_echo(value: str) -> str:
+            """Echo a value after a delay."""
+            await asyncio.sleep(0.2)
+            return value
+
+        sandbox = create_sandbox_tool(tools=[slow_echo], batch=True)
+        start = time.perf_counter()
+        result = sandbox.run(
+            """
+            const results = await batch(["a", "b", "c", "d"].map(
+                (value) => ({tool_name: "slow_echo", args: {value}})
+            ));
+            console.log(results.map((r) => r.value).join(""));
+        """,
+            language="javascript",
+        )
+
+        assert result.strip() == "abcd"
+        assert time.perf_counter() - start < 0.6
+
+    def test_async_tools_share_one_loop(self) -> None:
+        """Async invocations are gathered on one loop, bounded by max_workers."""
+        loops: set[int] = set()
+        in_flight = peak = 0
+
+        async def fetch(n: int) -> int:
+            nonlocal in_flight, peak
+            loops.add(id(asyncio.get_running_loop()))
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return n * 2
+
+        before = set(threading.enumerate())
+        handler = create_batch_handler(
+            {"fetch": fetch}, lambda m, p: None, max_workers=2
+        )
+        try:
+            for _ in range(2):
+                results = handler(
+                    [{"tool_name": "fetch", "args": {"n": n}} for n in range(5)]
+                )
+                assert [r["value"] for r in results] == [0, 2, 4, 6, 8]
+        finally:
+            handler.close()
+
+        assert len(loops) == 1
+        assert peak == 2
+        assert set(threading.enumerate()) <= before
+
+
+class TestCacheable:
+    """Tests for create_sandbox_tool(cacheable=...)."""
+
+    def test_repeated_calls_reuse_result(self) -> None:
+        """Cacheable tools run once per distinct argument set but are still counted."""
+        calls: list[str] = []
+
+        def lookup(key: str) -> str:
+            """Look up a key."""
+            calls.append(key)
+            return key.upper()
+
+        def stamp(key: str) -> int:
+            """Not cacheable."""
+            calls.append("stamp")
+            return len(calls)
+
+        sandbox = create_sandbox_tool(
+            tools=[lookup, stamp], cacheable={"lookup"}, max_calls=10, batch=True
+        )
+        result = sandbox.run(
+            """
+            const a = await lookup({key: "x"});
+            const b = await lookup({key: "x"});
+            const c = await lookup({key: "y"});
+            const [d] = await batch([{tool_name: "lookup", args: {key: "x"}}]);
+            await stamp({key: "x"});
+            await stamp({key: "x"});
+            console.log(a, b, c, d.value);
+        """,
+            language="javascript",
+        )
+
+        assert result.strip() == "X X Y X"
+        assert calls == ["x", "y", "stamp", "stamp"]
+        assert sandbox.sandbox.get_call_counts()["cap:method:mcp:lookup"] == 6
+
+    def test_cache_is_bounded(self) -> None:
+        """Only the most recently used argument sets stay cached."""
+        calls: list[int] = []
+
+        def square(n: int) -> int:
+            calls.append(n)
+            return n * n
+
+        cached = _memoize(square, maxsize=2)
+        assert [cached(n=1), cached(n=2), cached(n=1), cached(n=3)] == [1, 4, 1, 9]
+        # n=2 was least recently used when n=3 arrived, so it was evicted
+        assert [cached(n=1), cached(n=2)] == [1, 4]
+        assert calls == [1, 2, 3, 2]
+
+
 # === Tests for constraint parsing ===
 
 
@@ -467,3 +755,41 @@ class TestDocumentationAsyncMethods:
         )
 
         assert "hello async" in result, f"Async methods should work: {result!r}"
+
+
+class TestWithLanguage:
+    """Tests for SandboxTool.with_language()."""
+
+    def test_bound_runners_match_run(self) -> None:
+        """Bound runners produce the same output as run()."""
+        sandbox = create_sandbox_tool(tools=[greet])
+        js = sandbox.with_language("javascript")
+        sh = sandbox.with_language("shell")
+
+        code = "console.log(await greet({name: 'Ada'}));"
+        assert js(code) == sandbox.run(code, language="javascript")
+        assert "Hello, Ada!" in js(code)
+        assert sh("echo hi | tr 'a-z' 'A-Z'").strip() == "HI"
+
+    def test_on_output_streams_chunks(self) -> None:
+        """on_output sees output while the script runs, for both languages."""
+        sandbox = create_sandbox_tool(tools=[greet])
+        chunks: list[str] = []
+
+        result = sandbox.run(
+            "console.log(1); console.log(await greet({name: 'Ada'}));",
+            language="javascript",
+            on_output=chunks.append,
+        )
+        assert "".join(chunks) == result
+        assert len(chunks) == 2
+
+        chunks.clear()
+        sh = sandbox.with_language("shell")
+        assert sh("echo hi", on_output=chunks.append) == "".join(chunks)
+
+    def test_unknown_language_raises(self) -> None:
+        """Unknown languages are rejected when binding."""
+        sandbox = create_sandbox_tool()
+        with pytest.raises(ValueError, match="Unknown language"):
+            sandbox.with_language("python")
@@ -235,6 +235,84 @@ class TestConstraintSet:
         cs1.extend(cs2)
         assert len(cs1) == 2
 
+    def test_extend_after_evaluate(self) -> None:
+        # Checks compiled by an earlier evaluate() must pick up new clauses
+        cs1 = ConstraintSet([Constraint.ge("x", 0)])
+        cs1.evaluate({"x": 500})
+
+        cs1.extend(ConstraintSet([Constraint.le("x", 100)]))
+        with pytest.raises(ConstraintError):
+            cs1.evaluate({"x": 500})
+
+    def test_predicate_matches_evaluate(self) -> None:
+        constraint = Constraint.or_(
+            [Constraint.le("amount", 100), Constraint.starts_with("to", "@corp")]
+        )
+        test = constraint.predicate()
+
+        assert test({"amount": 50})
+        assert test({"amount": 500, "to": "@corp.com"})
+        assert not test({"amount": 500, "to": "@evil.com"})
+        with pytest.raises(ConstraintError):
+            constraint.evaluate({"amount": 500, "to": "@evil.com"})
+
+    def test_allows_matches_evaluate(self) -> None:
+        cs = ConstraintSet(
+            [
+                Param("amount") <= 2500000,
+                Param("amount") > 0,
+                Param("currency").is_in(["USD", "EUR"]),
+            ]
+        )
+
+        assert cs.allows({"amount": 100, "currency": "USD"})
+        for params in (
+            {"amount": 0, "currency": "USD"},
+            {"amount": 100, "currency": "GBP"},
+            {"amount": 100},
+            {"amount": "100", "currency": "USD"},
+        ):
+            assert not cs.allows(params)
+            with pytest.raises(ConstraintError):
+                cs.evaluate(params)
+
+    def test_allows_sees_edits(self) -> None:
+        cs = ConstraintSet([Param("amount") <= 100])
+        assert not cs.allows({"amount": 500})
+
+        cs.constraints = ()
+        assert cs.allows({"amount": 500})
+
+        cs.constraints = (Param("currency").is_in(["USD", "EUR"]),)
+        assert cs.allows({"amount": 500, "currency": "EUR"})
+        cs.constraints[0].values = ("USD",)
+        assert not cs.allows({"amount": 500, "currency": "EUR"})
+        cs.constraints[0].type = "not_in"
+        assert cs.allows({"amount": 500, "currency": "EUR"})
+
+        with pytest.raises(AttributeError):
+            cs.constraints.append(Param("amount") <= 100)  # type: ignore[attr-defined]
+
+    def test_predicate_is_compiled_once(self) -> None:
+        constraint = Constraint.and_([Param("x") > 0, Param("x") < 10])
+        predicate = constraint.predicate()
+        constraint.evaluate({"x": 5})
+        assert constraint.predicate() is predicate
+
+        # Changing a nested constraint recompiles its parents
+        cs = ConstraintSet([constraint])
+        assert cs.allows({"x": 5})
+        constraint.constraints[1].value = 3
+        assert not constraint.predicate()({"x": 5})
+        assert not cs.allows({"x": 5})
+
+    def test_allows_with_unhashable_values(self) -> None:
+        cs = ConstraintSet([Param("tags").is_in([["a"], ["b"]])])
+
+        assert cs.allows({"tags": ["a"]})
+        assert not cs.allows({"tags": ["c"]})
+        assert not ConstraintSet([Param("x").is_in([1, 2])]).allows({"x": [1]})
+
 
 class TestParamDSL:
     """Tests for the Param fluent builder."""
@@ -307,6 +307,36 @@ class TestShellIntegration:
         assert "apricot" in result
         assert "banana" not in result
 
+    def test_large_stdin(self) -> None:
+        """Stdin larger than the host buffer is streamed in chunks."""
+        sandbox = Sandbox()
+        result = sandbox.shell("wc -c", stdin="x" * 20000)
+        assert "20000" in result
+
+    def test_large_js_via_stdin(self) -> None:
+        """JavaScript piped via stdin is not bound by the buffer size."""
+        sandbox = Sandbox()
+        code = "\n".join(f"const v{i} = {i};  // {'-' * 40}" for i in range(300))
+        result = sandbox.execute("", stdin=code + "\nconsole.log(v299);")
+        assert result.strip() == "299"
+
+    def test_execute_without_capturing_stdout(self) -> None:
+        """capture_stdout=False drops console.log but keeps side effects."""
+        sandbox = Sandbox()
+        result = sandbox.execute(
+            """
+            console.log("noise");
+            await fs.writeFile('/workspace/out.txt', 'kept');
+            return "also dropped";
+            """,
+            capture_stdout=False,
+        )
+        assert result == ""
+        assert sandbox.shell("cat /workspace/out.txt").strip() == "kept"
+
+        # Later executions print normally again
+        assert sandbox.execute('console.log("hi")').strip() == "hi"
+
 
 class TestAsyncFsAPI:
     """Tests for the async fs API in JavaScript."""
@@ -424,6 +454,223 @@ class TestCapabilityEnforcementE2E:
         # Denied - constraint violation
         assert not sandbox.can_call("api/users", {"limit": 200})
 
+    def test_try_call_invokes_handler(self) -> None:
+        """Sandbox.try_call dispatches allowed calls and charges the budget."""
+        calls: list[tuple[str, dict[str, Any]]] = []
+
+        def handle_tool(method: str, params: dict[str, Any]) -> dict[str, Any]:
+            calls.append((method, params))
+            return {"sent": params["amount"]}
+
+        sandbox = Sandbox(
+            capabilities=[
+                MethodCapability(
+                    method_pattern="mcp:transfer",
+                    constraints=ConstraintSet([Param("amount") <= 1000]),
+                    max_calls=2,
+                )
+            ],
+            tool_handler=handle_tool,
+        )
+
+        assert sandbox.try_call("mcp:transfer", {"amount": 500}) == {"sent": 500}
+        # Handler sees the name without the mcp: prefix
+        assert calls == [("transfer", {"amount": 500})]
+        assert sandbox.get_remaining_calls("cap:method:mcp:transfer") == 1
+
+    def test_try_call_denied(self) -> None:
+        """Sandbox.try_call raises without calling the handler when denied."""
+        from amla_sandbox import CallLimitExceededError, CapabilityError
+
+        calls: list[str] = []
+
+        def handle_tool(method: str, params: dict[str, Any]) -> str:
+            calls.append(method)
+            return "ok"
+
+        sandbox = Sandbox(
+            capabilities=[
+                MethodCapability(
+                    method_pattern="api/*",
+                    constraints=ConstraintSet([Param("limit") <= 100]),
+                    max_calls=1,
+                )
+            ],
+            tool_handler=handle_tool,
+        )
+
+        with pytest.raises(CapabilityError, match="failed constraint check"):
+            sandbox.try_call("api/users", {"limit": 200})
+        with pytest.raises(CapabilityError, match="No capability authorizes"):
+            sandbox.try_call("other/method", {})
+        # Denied calls don't consume budget
+        assert sandbox.get_remaining_calls("cap:method:api/*") == 1
+
+        sandbox.try_call("api/users", {"limit": 10})
+        with pytest.raises(CallLimitExceededError):
+            sandbox.try_call("api/users", {"limit": 10})
+        assert calls == ["api/users"]
+
+    def test_try_call_is_audited(self) -> None:
+        """Host-dispatched calls are recorded whether allowed or denied."""
+        from amla_sandbox import CapabilityError
+        from amla_sandbox.audit import AuditConfig
+
+        sandbox = Sandbox(
+            capabilities=[MethodCapability(method_pattern="api/users")],
+            tool_handler=lambda method, params: "ok",
+            audit_config=AuditConfig(agent_id="agent-1"),
+        )
+
+        sandbox.try_call("api/users", {"limit": 10})
+        with pytest.raises(CapabilityError):
+            sandbox.try_call("api/orders", {})
+
+        entries = list(sandbox.get_audit_entries(entry_type="tool_call"))
+        assert [(e.data["tool"], e.data["allowed"]) for e in entries] == [
+            ("api/users", True),
+            ("api/orders", False),
+        ]
+        assert all(e.data["dispatch"] == "host" for e in entries)
+        assert all(e.agent_id == "agent-1" for e in entries)
+        assert "No capability authorizes" in entries[1].data["error"]
+
+    def test_try_call_checks_pca(self) -> None:
+        """try_call only reaches tools the PCA grants, like a JS call."""
+        from amla_sandbox import CapabilityError
+        from amla_sandbox.auth import EphemeralAuthority
+
+        authority = EphemeralAuthority()
+        sandbox = Sandbox(
+            pca=authority.create_pca(capabilities=["tool_call:api/**"]).to_cbor(),
+            trusted_authorities=[authority.public_key_hex()],
+            capabilities=[MethodCapability(method_pattern="**")],
+            tool_handler=lambda method, params: "ok",
+        )
+
+        assert sandbox.try_call("api/users", {}) == "ok"
+        assert sandbox.try_call("mcp:api/users", {}) == "ok"
+        with pytest.raises(CapabilityError, match="PCA does not grant"):
+            sandbox.try_call("admin/reset", {})
+
+    def test_can_call_batch_matches_can_call(self) -> None:
+        """can_call_batch gives the same answers as can_call per entry."""
+        sandbox = Sandbox(
+            capabilities=[
+                MethodCapability(
+                    method_pattern="api/*",
+                    constraints=ConstraintSet([Param("limit") <= 100]),
+                    max_calls=1,
+                ),
+                MethodCapability(
+                    method_pattern="api/search",
+                    constraints=ConstraintSet([Param("limit") <= 1000]),
+                ),
+            ],
+            tool_handler=lambda method, params: "ok",
+        )
+
+        batch = [{"limit": 10}, {"limit": 500}, {"limit": 5000}, {}]
+        for method in ("api/users", "api/search", "other/method"):
+            expected = [sandbox.can_call(method, p) for p in batch]
+            assert sandbox.can_call_batch(method, batch) == expected
+
+        # Exhausting the first capability leaves only the fallback
+        sandbox.try_call("api/users", {"limit": 10})
+        assert sandbox.can_call_batch("api/users", batch) == [False] * 4
+        assert sandbox.can_call_batch("api/search", batch) == [
+            True,
+            True,
+            False,
+            False,
+        ]
+
+    def test_can_call_batch_per_entry_methods(self) -> None:
+        """can_call_batch accepts one method per entry."""
+        sandbox = Sandbox(
+            capabilities=[
+                MethodCapability(method_pattern="read/*"),
+                MethodCapability(
+                    method_pattern="write/*",
+                    constraints=ConstraintSet([Param("size") <= 10]),
+                ),
+            ],
+            tool_handler=lambda method, params: "ok",
+        )
+
+        methods = ["read/a", "write/a", "write/b", "delete/a"]
+        params = [{}, {"size": 5}, {"size": 50}, {}]
+        assert sandbox.can_call_batch(methods, params) == [
+            sandbox.can_call(m, p) for m, p in zip(methods, params)
+        ]
+        with pytest.raises(ValueError):
+            sandbox.can_call_batch(methods, params[:2])
+
+    def test_exact_patterns_only(self) -> None:
+        """Sandboxes granting only exact methods match nothing else."""
+        sandbox = Sandbox(
+            capabilities=[
+                MethodCapability(
+                    method_pattern="api/users",
+                    constraints=ConstraintSet([Param("limit") <= 10]),
+                ),
+                MethodCapability(
+                    method_pattern="api/users",
+                    constraints=ConstraintSet([Param("role") == "admin"]),
+                ),
+                MethodCapability(method_pattern="api/orders", max_calls=1),
+            ],
+            tool_handler=lambda method, params: "ok",
+        )
+
+        assert sandbox.can_call("api/users", {"limit": 5})
+        assert sandbox.can_call("api/users", {"limit": 500, "role": "admin"})
+        assert not sandbox.can_call("api/users", {"limit": 500})
+        assert not sandbox.can_call("api/user", {"limit": 5})
+        assert not sandbox.can_call("api/*", {"limit": 5})
+
+        sandbox.try_call("api/orders", {})
+        assert not sandbox.can_call("api/orders")
+
+    def test_wildcard_match_cache_is_bounded(self) -> None:
+        """Method names matched by a wildcard can't grow the cache unbounded."""
+        from amla_sandbox.runtime.wasm import METHOD_CACHE_SIZE
+
+        sandbox = Sandbox(
+            capabilities=[MethodCapability(method_pattern="**", max_calls=5)],
+            tool_handler=lambda method, params: "ok",
+        )
+        assert sandbox._runtime is not None
+
+        for i in range(METHOD_CACHE_SIZE + 50):
+            assert sandbox.can_call(f"made/up/{i}")
+        assert len(sandbox._runtime._method_caps) == METHOD_CACHE_SIZE
+        # Evicted names are matched again on demand
+        assert sandbox.can_call("made/up/0")
+
+    def test_replace_capabilities(self) -> None:
+        """replace_capabilities swaps permissions and restores budgets."""
+        sandbox = Sandbox(
+            capabilities=[MethodCapability(method_pattern="api/*", max_calls=1)],
+            tool_handler=lambda method, params: "ok",
+        )
+        sandbox.try_call("api/users", {})
+        assert not sandbox.can_call("api/users")
+
+        sandbox.replace_capabilities(
+            [
+                MethodCapability(method_pattern="api/*", max_calls=2),
+                MethodCapability(method_pattern="admin/*"),
+            ]
+        )
+        assert sandbox.get_remaining_calls("cap:method:api/*") == 2
+        assert sandbox.can_call("admin/reset")
+        assert len(sandbox.get_capabilities()) == 2
+
+        sandbox.replace_capabilities([])
+        assert not sandbox.can_call("api/users")
+        assert sandbox.get_call_counts() == {}
+
 
 class TestEdgeCases:
     """Tests for edge cases and error handling."""
@@ -560,10 +560,12 @@ class TestRuntimeCapabilityEnforcement:
             capabilities=["tool_call:**"],  # Allow all for this test
         )
         # Override capabilities for more specific testing
-        runtime._capabilities = [
-            make_limited_charge_cap(),
-            make_readonly_stripe_cap(),
-        ]
+        runtime.replace_capabilities(
+            [
+                make_limited_charge_cap(),
+                make_readonly_stripe_cap(),
+            ]
+        )
 
         # Allowed by limited_charge_cap
         assert runtime.can_call(
@@ -589,7 +591,7 @@ class TestRuntimeCapabilityEnforcement:
         ]
         # Use for_testing() and override capabilities
         runtime = Runtime.for_testing(capabilities=["tool_call:**"])
-        runtime._capabilities = caps
+        runtime.replace_capabilities(caps)
 
         returned = runtime.get_capabilities()
         assert len(returned) == 3
@@ -685,7 +687,7 @@ class TestEdgeCases:
         """Runtime with no capabilities denies all tool calls."""
         # Use for_testing() but then clear capabilities
         runtime = Runtime.for_testing(capabilities=["tool_call:**"])
-        runtime._capabilities = []  # Clear capabilities
+        runtime.replace_capabilities([])  # Clear capabilities
 
         assert not runtime.can_call("any/method", {})
         assert not runtime.can_call("stripe/charges/create", {"amount": 100})
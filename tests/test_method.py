@@ -1,5 +1,7 @@
 """Tests for MethodCapability."""
 
+import dataclasses
+
 import pytest
 
 from amla_sandbox.capabilities import (
@@ -37,6 +39,29 @@ class TestMethodCapability:
         assert cap.max_calls == 100
         assert cap.input_schema == {"type": "object"}
 
+    def test_immutable(self) -> None:
+        cap = MethodCapability(method_pattern="stripe/charges/*", max_calls=10)
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            cap.max_calls = 100  # type: ignore[misc]
+
+        widened = dataclasses.replace(cap, max_calls=100)
+        assert widened.max_calls == 100
+        assert cap.max_calls == 10
+
+    def test_hashable_with_schema_and_constraints(self) -> None:
+        def make() -> MethodCapability:
+            return MethodCapability(
+                method_pattern="stripe/charges/*",
+                constraints=ConstraintSet([Param("amount") <= 100]),
+                max_calls=10,
+                input_schema={"type": "object"},
+            )
+
+        cap = make()
+        assert hash(cap) == hash(make())
+        assert {cap, make()} == {cap}
+
     def test_key(self) -> None:
         cap = MethodCapability(method_pattern="stripe/charges/*")
         assert cap.key() == "cap:method:stripe/charges/*"
@@ -12,6 +12,13 @@ class TestMethodMatchesPattern:
             "stripe/charges/create", "stripe/charges/refund"
         )
 
+    def test_exact_match_is_literal(self) -> None:
+        # Patterns without * compare as whole strings
+        assert method_matches_pattern("transfer", "transfer")
+        assert not method_matches_pattern("mcp:transfer", "transfer")
+        assert not method_matches_pattern("stripe/charges", "stripe/charges/")
+        assert not method_matches_pattern("stripe//charges", "stripe/charges")
+
     def test_single_wildcard(self) -> None:
         # * matches exactly one segment
         assert method_matches_pattern("stripe/charges/create", "stripe/charges/*")